@@ -1,22 +1,19 @@
 import streamlit as st
-import pandas as pd
 import time
-import io
-import requests
-import re
 import os
 import base64
-from urllib.parse import quote
-from bs4 import BeautifulSoup
 from datetime import date
 
-# --- Import Library Selenium ---
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+# Hanya modul ringan; pandas, requests, BeautifulSoup dan Selenium dimuat oleh
+# proses worker saat scraping dimulai atau saat workbook kata kunci diunduh.
+from skena.duplikat import AMBANG
+from skena.ekspor import FORMAT
+from skena.job import baca_parameter, baca_status, buat_job, daftar_job, hentikan_job, jalankan_di_latar, path_hasil
+from skena.pengaturan import BACKEND, JUMLAH_WORKER
+from skena.sheet import muat_sheet
+
+# Daerah bawaan; kolom daerah lain di sheet daerah dapat dipilih di halaman Neraca
+NAMA_DAERAH = "Konawe Selatan"
 
 # --- Konfigurasi Halaman Streamlit ---
 st.set_page_config(
@@ -32,26 +29,35 @@ if "sub_page" not in st.session_state:
     st.session_state.sub_page = "Sosial"
 if 'scraping_done' not in st.session_state:
     st.session_state.scraping_done = False
-if 'excel_data' not in st.session_state:
-    st.session_state.excel_data = None
+if 'hasil_path' not in st.session_state:
+    st.session_state.hasil_path = None
+if 'hasil_format' not in st.session_state:
+    st.session_state.hasil_format = "xlsx"
 if 'file_name' not in st.session_state:
     st.session_state.file_name = ""
 if 'total_duration' not in st.session_state:
     st.session_state.total_duration = ""
 if 'no_results' not in st.session_state:
     st.session_state.no_results = False
+if 'job_id' not in st.session_state:
+    st.session_state.job_id = st.query_params.get("job")
 
 # --- Fungsi-Fungsi Inti ---
 
-@st.cache_data
-def load_data_from_url(url, sheet_name=0):
-    """Memuat data dari URL Google Sheets ke dalam DataFrame."""
-    try:
-        df = pd.read_excel(url, sheet_name=sheet_name)
-        return df
-    except Exception as e:
-        st.error(f"Gagal memuat data dari URL. Pastikan link dapat diakses. Error: {e}")
-        return None
+def load_data_from_url(daftar_sumber, paksa=False):
+    """Memuat sheet Google Sheets dari snapshot lokal (diunduh bersamaan jika belum ada).
+
+    Mengembalikan daftar ``{kolom: [nilai, ...]}`` sesuai urutan ``daftar_sumber``;
+    None untuk sheet yang gagal dimuat.
+    """
+    hasil = []
+    for snapshot, error in muat_sheet(daftar_sumber, paksa=paksa):
+        if error is not None and snapshot is not None:
+            st.warning(f"Gagal memperbarui data dari URL, memakai salinan terakhir ({time.strftime('%d/%m/%Y %H:%M', time.localtime(snapshot['diambil']))}). Error: {error}")
+        elif error is not None:
+            st.error(f"Gagal memuat data dari URL. Pastikan link dapat diakses. Error: {error}")
+        hasil.append(snapshot["kolom"] if snapshot is not None else None)
+    return hasil
 
 def get_rentang_tanggal(tahun: int, triwulan: str, start_date=None, end_date=None):
     """Menghasilkan tanggal awal dan akhir berdasarkan tahun dan triwulan atau tanggal custom."""
@@ -70,133 +76,97 @@ def get_rentang_tanggal(tahun: int, triwulan: str, start_date=None, end_date=Non
     awal, akhir = triwulan_dict[triwulan]
     return f"{awal}/{tahun}", f"{akhir}/{tahun}"
 
-def ambil_ringkasan(link):
-    """Mengambil ringkasan/deskripsi dari sebuah link berita."""
-    try:
-        response = requests.get(link, timeout=10, headers={'User-Agent': 'Mozilla/5.0'})
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        deskripsi = soup.find('meta', attrs={'name': 'description'})
-        if deskripsi and deskripsi.get('content'): return deskripsi['content']
-
-        og_desc = soup.find('meta', attrs={'property': 'og:description'})
-        if og_desc and og_desc.get('content'): return og_desc['content']
-
-        p_tag = soup.find('p')
-        if p_tag: return p_tag.get_text(strip=True)
-    except Exception:
-        return ""
-    return ""
-
-def start_scraping(tanggal_awal, tanggal_akhir, kata_kunci_lapus_df, kata_kunci_daerah_df, start_time):
-    """Fungsi utama yang membungkus seluruh logika scraping."""
-    kata_kunci_lapus_dict = {c: kata_kunci_lapus_df[c].dropna().astype(str).str.strip().tolist() for c in kata_kunci_lapus_df.columns}
-    kata_kunci_daerah_dict = {c: kata_kunci_daerah_df[c].dropna().astype(str).str.strip().tolist() for c in kata_kunci_daerah_df.columns}
-
-    nama_daerah = "Konawe Selatan"
-    if nama_daerah not in kata_kunci_daerah_dict:
-        st.error(f"Kolom '{nama_daerah}' tidak ditemukan dalam data daerah.")
-        return None
-
-    kecamatan_list = kata_kunci_daerah_dict[nama_daerah]
-    lokasi_filter = [nama_daerah.lower()] + [kec.lower() for kec in kecamatan_list]
-
-    status_placeholder = st.empty()
-    status_placeholder.info("Mempersiapkan browser...")
-
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-
-    try:
-        driver = webdriver.Chrome(options=chrome_options)
-    except Exception as e:
-        st.error(f"Gagal memulai browser Chrome. Pastikan Chrome terinstal atau driver sudah benar. Error: {e}")
-        return None
-
-    semua_hasil_df = {}
-    total_kategori = len(kata_kunci_lapus_dict)
-    kategori_ke = 0
-    for kategori, kata_kunci_list in kata_kunci_lapus_dict.items():
-        kategori_ke += 1
-        hasil_kategori, set_link = [], set()
-        nomor = 1
-        for keyword_raw in kata_kunci_list:
-            elapsed_time = time.time() - start_time
-            minutes = int(elapsed_time // 60)
-            seconds = int(elapsed_time % 60)
-            status_placeholder.info(f"⏳ Proses scraping sedang berjalan... ({minutes} menit {seconds} detik) | 📁 Memproses kategori {kategori_ke} dari {total_kategori}: {kategori}")
-
-            if pd.isna(keyword_raw): continue
-            keyword = str(keyword_raw).strip()
-            if not keyword: continue
-            
-            st.text(f"  ➡️ 🔍 Mencari: {keyword}")
-            
-            query = quote(keyword + " " + nama_daerah)
-            base_url = f"https://www.google.com/search?q={query}&tbm=nws&tbs=cdr:1,cd_min:{tanggal_awal},cd_max:{tanggal_akhir},sbd:1"
-
-            try:
-                driver.get(base_url)
-                time.sleep(2)
-
-                pagination_links = driver.find_elements(By.XPATH, '//a[contains(@href, "start=")]')
-                start_values = {0}
-                for link in pagination_links:
-                    href = link.get_attribute("href")
-                    match = re.search(r"[?&]start=(\d+)", href)
-                    if match:
-                        start_values.add(int(match.group(1)))
-                
-                for start in sorted(start_values):
-                    page_url = base_url + f"&start={start}"
-                    driver.get(page_url)
-                    
-                    try:
-                        WebDriverWait(driver, 10).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "div.SoaBEf"))
-                        )
-                        search_results = driver.find_elements(By.CSS_SELECTOR, "div.SoaBEf")
-
-                        for result in search_results:
-                            try:
-                                link_element = result.find_element(By.TAG_NAME, "a")
-                                link = link_element.get_attribute("href")
-                                if link in set_link: continue
-
-                                judul = result.find_element(By.CSS_SELECTOR, "div.MBeuO").text.strip()
-                                tanggal = result.find_element(By.CSS_SELECTOR, "div.OSrXXb > span").text.strip()
-                                ringkasan = ambil_ringkasan(link)
-
-                                # Filter Fleksibel
-                                lokasi_ditemukan = any(loc in judul.lower() or loc in ringkasan.lower() for loc in lokasi_filter)
-                                keyword_ditemukan = keyword.lower() in ringkasan.lower() or keyword.lower() in judul.lower()
-
-                                if lokasi_ditemukan and keyword_ditemukan:
-                                    hasil_kategori.append({"Nomor": nomor, "Kata Kunci": keyword, "Judul": judul, "Link": link, "Tanggal": tanggal, "Ringkasan": ringkasan})
-                                    nomor += 1
-                                    set_link.add(link)
-                            except NoSuchElementException:
-                                continue
-                    except TimeoutException:
-                        st.text(f"     -- Tidak ada hasil di halaman ini untuk '{keyword}'")
-                        continue
-                        
-            except Exception as e:
-                st.warning(f"Terjadi error saat memproses keyword '{keyword}'. Melanjutkan... Error: {type(e).__name__}")
-
-        if hasil_kategori:
-            df_kat = pd.DataFrame(hasil_kategori)
-            semua_hasil_df[kategori] = df_kat
-            st.markdown(f"**Hasil Pratinjau Kategori: {kategori}**")
-            st.dataframe(df_kat.head(3), use_container_width=True)
-
-    driver.quit()
-    status_placeholder.empty()
-    return semua_hasil_df
+def format_durasi(detik):
+    """Mengubah jumlah detik menjadi teks 'X menit Y detik'."""
+    return f"{int(detik // 60)} menit {int(detik % 60)} detik"
+
+def start_scraping(tanggal_awal, tanggal_akhir, kata_kunci_lapus_dict, kata_kunci_daerah_dict, label, bypass_cache=False, backend_nama=BACKEND, jumlah_worker=JUMLAH_WORKER, hemat_ringkasan=False, format_hasil="xlsx", daftar_daerah=(NAMA_DAERAH,), mode_duplikat=None, ambang_duplikat=AMBANG, inkremental=False):
+    """Membuat job scraping dan menjalankannya di proses worker; mengembalikan job_id."""
+    for nama_daerah in daftar_daerah:
+        if nama_daerah not in kata_kunci_daerah_dict:
+            st.error(f"Kolom '{nama_daerah}' tidak ditemukan dalam data daerah.")
+            return None
+
+    job_id = buat_job({
+        "timestamp": time.strftime("%Y%m%d-%H%M%S"),
+        "label": label,
+        "tanggal_awal": tanggal_awal,
+        "tanggal_akhir": tanggal_akhir,
+        "daerah": {nama_daerah: kata_kunci_daerah_dict[nama_daerah] for nama_daerah in daftar_daerah},
+        "kata_kunci": kata_kunci_lapus_dict,
+        "backend": backend_nama,
+        "jumlah_worker": jumlah_worker,
+        "hemat_ringkasan": hemat_ringkasan,
+        "bypass_cache": bypass_cache,
+        "format": format_hasil,
+        "duplikat": mode_duplikat,
+        "ambang_duplikat": ambang_duplikat,
+        "inkremental": inkremental,
+    })
+    jalankan_di_latar(job_id)
+    return job_id
+
+def buka_job(job_id):
+    """Menampilkan job di halaman ini; job_id juga disimpan di URL agar bisa dibuka lagi setelah tab ditutup."""
+    st.session_state.job_id = job_id
+    st.query_params["job"] = job_id
+
+def tutup_job():
+    st.session_state.job_id = None
+    st.query_params.pop("job", None)
+
+@st.fragment(run_every=2)
+def tampilkan_progres_job(job_id):
+    """Menampilkan progres job yang berjalan di latar; diperbarui setiap 2 detik."""
+    status = baca_status(job_id)
+    parameter = baca_parameter(job_id) or {}
+    if status is None:
+        st.error("Job scraping tidak ditemukan.")
+        if st.button("Kembali", use_container_width=True):
+            tutup_job()
+            st.rerun()
+        return
+
+    if status["status"] == "selesai":
+        st.session_state.total_duration = format_durasi(status.get("durasi_detik", 0))
+        if status.get("ada_hasil"):
+            # Hanya path yang disimpan di session; berkas dibaca saat diunduh
+            format_hasil = status.get("format", "xlsx")
+            st.session_state.hasil_path = path_hasil(job_id, format_hasil)
+            st.session_state.hasil_format = format_hasil
+            st.session_state.file_name = f"Hasil_Scraping_{parameter.get('timestamp', job_id)}.{format_hasil}"
+            st.session_state.scraping_done = True
+        else:
+            st.session_state.no_results = True
+        tutup_job()
+        st.rerun()
+
+    st.header("Proses & Hasil Scraping")
+    st.info(f"{parameter.get('label', '')} (Periode: {parameter.get('tanggal_awal')} s/d {parameter.get('tanggal_akhir')})")
+    total, selesai = status.get("total", 0), status.get("selesai", 0)
+    st.progress(selesai / total if total else 0.0, text=f"⏳ {selesai} dari {total} pencarian selesai ({format_durasi(status.get('durasi_detik', 0))})")
+    if status.get("log"):
+        st.code("\n".join(status["log"][-15:]), language=None)
+
+    if status["status"] in ("menunggu", "berjalan"):
+        st.caption("Scraping berjalan di latar belakang. Halaman ini boleh ditutup; buka lagi untuk melihat progres.")
+        if st.button("⏹️ Hentikan", use_container_width=True):
+            hentikan_job(job_id)
+            st.rerun()
+    else:
+        if status["status"] == "gagal":
+            st.error(status.get("pesan", "Job scraping gagal."))
+        else:
+            st.warning("Job scraping terhenti sebelum selesai. Lanjutkan untuk meneruskan dari checkpoint terakhir.")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("▶️ Lanjutkan", use_container_width=True, type="primary"):
+                jalankan_di_latar(job_id)
+                st.rerun()
+        with col2:
+            if st.button("Tutup", use_container_width=True):
+                tutup_job()
+                st.rerun()
 
 def display_pdf(file_path):
     """Fungsi untuk membaca file PDF dan menampilkannya di Streamlit."""
@@ -293,10 +263,15 @@ elif st.session_state.page == "Scraping":
         if st.session_state.scraping_done:
             st.header("✅ Proses Selesai")
             st.success(f"Scraping telah selesai dalam {st.session_state.total_duration}. Anda dapat mengunduh hasilnya di bawah.")
-            st.download_button(label="📥 Unduh Hasil Scraping (Excel)", data=st.session_state.excel_data, file_name=st.session_state.file_name, mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", use_container_width=True)
+            nama_format, mime = FORMAT[st.session_state.hasil_format]
+            if st.session_state.hasil_path and os.path.exists(st.session_state.hasil_path):
+                with open(st.session_state.hasil_path, "rb") as berkas_hasil:
+                    st.download_button(label=f"📥 Unduh Hasil Scraping ({nama_format})", data=berkas_hasil, file_name=st.session_state.file_name, mime=mime, use_container_width=True)
+            else:
+                st.error("Berkas hasil tidak ditemukan lagi di server.")
             if st.button("🔄 Mulai Scraping Baru (Reset)", use_container_width=True):
                 st.session_state.scraping_done = False
-                st.session_state.excel_data = None
+                st.session_state.hasil_path = None
                 st.session_state.file_name = ""
                 st.session_state.total_duration = ""
                 st.session_state.no_results = False
@@ -307,17 +282,33 @@ elif st.session_state.page == "Scraping":
             if st.button("🔄 Coba Lagi", use_container_width=True):
                 st.session_state.no_results = False
                 st.rerun()
+        elif st.session_state.job_id:
+            tampilkan_progres_job(st.session_state.job_id)
         else:
-            if st.button("🔄 Muat Ulang Data Kata Kunci"):
-                st.cache_data.clear()
-                st.success("Cache data telah dibersihkan. Memuat data baru...")
+            job_tertunda = daftar_job(belum_selesai=True)
+            if job_tertunda:
+                with st.expander(f"⏯️ Job scraping yang belum selesai ({len(job_tertunda)})"):
+                    for job_id, status in job_tertunda:
+                        parameter = baca_parameter(job_id) or {}
+                        col1, col2 = st.columns([4, 1])
+                        with col1:
+                            st.write(f"**{job_id}** · {status['status']} · {status.get('selesai', 0)}/{status.get('total', 0)} pencarian · {parameter.get('label', '')} ({parameter.get('tanggal_awal')} s/d {parameter.get('tanggal_akhir')})")
+                        with col2:
+                            if st.button("Buka", key=f"buka_{job_id}", use_container_width=True):
+                                buka_job(job_id)
+                                st.rerun()
+
+            col_muat, col_cache = st.columns(2)
+            with col_muat:
+                muat_ulang = st.button("🔄 Muat Ulang Data Kata Kunci")
+            with col_cache:
+                bypass_cache = st.checkbox("Abaikan cache hasil scraping sebelumnya", key="bypass_cache", help="Semua halaman pencarian dan ringkasan berita diambil ulang, lalu cache diperbarui.")
             with st.spinner("Memuat data kata kunci dari Google Sheets..."):
-                df_lapus = load_data_from_url(url_lapus, sheet_name='Sheet1')
-                df_daerah = load_data_from_url(url_daerah)
+                kata_kunci_lapus, kata_kunci_daerah = load_data_from_url([(url_lapus, 'Sheet1'), (url_daerah, 0)], paksa=muat_ulang)
 
-            if df_lapus is not None and df_daerah is not None:
-                st.success("✅ Data kata kunci berhasil dimuat.")
-                original_categories = df_lapus.columns.tolist()
+            if kata_kunci_lapus is not None and kata_kunci_daerah is not None:
+                st.success("✅ Data kata kunci berhasil dimuat ulang." if muat_ulang else "✅ Data kata kunci berhasil dimuat.")
+                original_categories = list(kata_kunci_lapus)
                 
                 st.header("Atur Parameter Scraping")
                 
@@ -347,10 +338,30 @@ elif st.session_state.page == "Scraping":
                         options=original_categories
                     )
                 
+                daftar_daerah = st.multiselect(
+                    "Pilih daerah:",
+                    options=list(kata_kunci_daerah),
+                    default=[NAMA_DAERAH] if NAMA_DAERAH in kata_kunci_daerah else None,
+                    help="Beberapa daerah diproses dalam satu job dengan browser dan cache yang sama; hasil dipisah per daerah.",
+                )
+
+                backend_list = {"selenium": "Browser (Selenium/Chrome)", "http": "Ringan (HTTP tanpa browser)"}
+                backend_nama = st.selectbox("Metode pencarian:", options=list(backend_list), index=list(backend_list).index(BACKEND) if BACKEND in backend_list else 0, format_func=backend_list.get)
+                hemat_ringkasan = st.checkbox("Jangan ambil ringkasan untuk berita yang sudah lolos dari judulnya", help="Lebih cepat, tetapi kolom Ringkasan untuk berita tersebut dibiarkan kosong.")
+                opsi_duplikat = {None: "Simpan semua", "gabung": "Gabungkan ke kolom Sumber Lain", "lewati": "Lewati salinan"}
+                mode_duplikat = st.selectbox("Berita serupa (sindikasi):", options=list(opsi_duplikat), format_func=opsi_duplikat.get, help="Berita dengan judul hampir sama dari portal lain memakai ringkasan berita pertama tanpa diunduh lagi.")
+                ambang_duplikat = AMBANG
+                if mode_duplikat:
+                    ambang_duplikat = st.slider("Batas kemiripan judul:", min_value=0.5, max_value=1.0, value=AMBANG, step=0.05, help="Semakin tinggi, semakin mirip judul yang dianggap salinan.")
+                inkremental = st.checkbox("Hanya cari rentang tanggal yang belum pernah di-scrape", help="Berita dari run inkremental sebelumnya (daerah, kata kunci dan pengaturan filter yang sama) diambil dari arsip; hanya hari-hari yang belum tercakup yang dicari lagi. Nomor berita lama tidak berubah.")
+                format_hasil = st.selectbox("Format hasil:", options=list(FORMAT), format_func=lambda f: FORMAT[f][0], help="CSV dan Parquet berisi satu tabel dengan kolom Kategori, cocok untuk diolah lebih lanjut.")
+                jumlah_worker = st.number_input("Jumlah pencarian paralel:", min_value=1, max_value=8, value=min(JUMLAH_WORKER, 8), help="Kata kunci dibagi ke beberapa worker (browser Chrome atau sesi HTTP) yang berjalan bersamaan.")
+
                 is_disabled = (
                     tahun_input == "--Pilih Tahun--" or
                     triwulan_input == "--Pilih Triwulan--" or
                     mode_kategori == "--Pilih Opsi Kategori--" or
+                    not daftar_daerah or
                     (mode_kategori == 'Pilih Kategori Tertentu' and not kategori_terpilih)
                 )
                 
@@ -359,41 +370,19 @@ elif st.session_state.page == "Scraping":
                     tanggal_awal, tanggal_akhir = get_rentang_tanggal(tahun_int, triwulan_input, start_date, end_date)
                     
                     if tanggal_awal and tanggal_akhir:
-                        start_time = time.time()
-                        timestamp = time.strftime("%Y%m%d-%H%M%S")
-                        df_lapus_untuk_proses = df_lapus
+                        kata_kunci_untuk_proses = kata_kunci_lapus
 
                         if mode_kategori == 'Pilih Kategori Tertentu':
-                            df_lapus_untuk_proses = df_lapus[kategori_terpilih]
-                        
-                        st.header("Proses & Hasil Scraping")
-                        if mode_kategori == 'Pilih Kategori Tertentu':
-                            nama_kategori_str = ', '.join(kategori_terpilih)
-                            st.info(f"Memulai Scraping Kategori: {nama_kategori_str} (Periode: {tanggal_awal} s/d {tanggal_akhir})")
+                            kata_kunci_untuk_proses = {k: kata_kunci_lapus[k] for k in kategori_terpilih}
+                            label = f"Scraping Kategori: {', '.join(map(str, kategori_terpilih))}"
                         else:
-                            st.info(f"Memulai Scraping Seluruh Kategori (Periode: {tanggal_awal} s/d {tanggal_akhir})")
-
-                        hasil_dict = start_scraping(tanggal_awal, tanggal_akhir, df_lapus_untuk_proses, df_daerah, start_time)
-                        
-                        end_time = time.time()
-                        total_duration = end_time - start_time
-                        total_minutes = int(total_duration // 60)
-                        total_seconds = int(total_duration % 60)
-                        st.session_state.total_duration = f"{total_minutes} menit {total_seconds} detik"
-
-                        if hasil_dict:
-                            output = io.BytesIO()
-                            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                                for kategori, df in hasil_dict.items():
-                                    nama_sheet = f"Kategori {kategori}"
-                                    df.to_excel(writer, sheet_name=nama_sheet[:31], index=False)
-                            
-                            st.session_state.excel_data = output.getvalue()
-                            st.session_state.file_name = f"Hasil_Scraping_{timestamp}.xlsx"
-                            st.session_state.scraping_done = True
-                            st.rerun()
-                        else:
-                            st.session_state.no_results = True
+                            label = "Scraping Seluruh Kategori"
+                        if daftar_daerah != [NAMA_DAERAH]:
+                            label += f" · Daerah: {', '.join(map(str, daftar_daerah))}"
+
+                        job_id = start_scraping(tanggal_awal, tanggal_akhir, kata_kunci_untuk_proses, kata_kunci_daerah, label, bypass_cache=bypass_cache, backend_nama=backend_nama, jumlah_worker=int(jumlah_worker), hemat_ringkasan=hemat_ringkasan, format_hasil=format_hasil, daftar_daerah=daftar_daerah, mode_duplikat=mode_duplikat, ambang_duplikat=ambang_duplikat, inkremental=inkremental)
+                        if job_id:
+                            buka_job(job_id)
                             st.rerun()
                     else:
                         st.error("Harap pastikan rentang tanggal valid.")
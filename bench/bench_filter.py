@@ -0,0 +1,89 @@
+"""Micro-benchmark Filter Fleksibel: loop ``any(...)`` lama vs PencocokBerita.
+
+Jalankan dari root repo: ``python bench/bench_filter.py [--jumlah 20000]``.
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skena.filter import PencocokBerita  # noqa: E402
+
+KECAMATAN = [
+    "Andoolo", "Andoolo Barat", "Angata", "Baito", "Basala", "Benua", "Buke", "Kolono",
+    "Kolono Timur", "Konda", "Laeya", "Lainea", "Lalembuu", "Landono", "Laonti", "Moramo",
+    "Moramo Utara", "Mowila", "Palangga", "Palangga Selatan", "Ranomeeto", "Ranomeeto Barat",
+    "Sabulakoa", "Tinanggea", "Wolasi",
+]
+KEYWORD = "panen padi"
+
+
+def buat_data(jumlah, seed=0):
+    """Judul dan ringkasan sintetis; sebagian menyebut kecamatan dan/atau kata kunci."""
+    acak = random.Random(seed)
+    kosakata = ["".join(acak.choices(string.ascii_lowercase, k=acak.randint(3, 9))) for _ in range(3000)]
+    data = []
+    for i in range(jumlah):
+        judul = " ".join(acak.choices(kosakata, k=12)).title()
+        ringkasan = " ".join(acak.choices(kosakata, k=35))
+        if i % 4 == 0:
+            judul += " di " + acak.choice(KECAMATAN)
+        if i % 3 == 0:
+            judul += " " + KEYWORD.title()
+        if i % 5 == 0:
+            ringkasan += " warga " + acak.choice(KECAMATAN).lower() + " " + KEYWORD
+        data.append((judul, ringkasan))
+    return data
+
+
+def filter_lama(data, lokasi_filter):
+    lolos = 0
+    for judul, ringkasan in data:
+        lokasi_ditemukan = any(loc in judul.lower() or loc in ringkasan.lower() for loc in lokasi_filter)
+        keyword_ditemukan = KEYWORD.lower() in ringkasan.lower() or KEYWORD.lower() in judul.lower()
+        if lokasi_ditemukan and keyword_ditemukan:
+            lolos += 1
+    return lolos
+
+
+def filter_baru(data, pencocok):
+    return sum(1 for judul, ringkasan in data if pencocok.cocok(KEYWORD, judul, ringkasan))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jumlah", type=int, default=20000, help="jumlah judul sintetis")
+    parser.add_argument("--ulang", type=int, default=5, help="jumlah pengulangan timeit")
+    args = parser.parse_args()
+
+    data = buat_data(args.jumlah)
+    lokasi_filter = ["konawe selatan"] + [k.lower() for k in KECAMATAN]
+    substring = PencocokBerita.dari_daerah("Konawe Selatan", KECAMATAN)
+    batas_kata = PencocokBerita.dari_daerah("Konawe Selatan", KECAMATAN, batas_kata=True)
+
+    lolos_lama = filter_lama(data, lokasi_filter)
+    lolos_baru = filter_baru(data, substring)
+    if lolos_lama != lolos_baru:
+        sys.exit(f"Hasil berbeda: lama={lolos_lama} baru={lolos_baru}")
+    lolos_judul = sum(1 for judul, _ in data if substring.cocok_judul(KEYWORD, judul))
+
+    print(f"{args.jumlah} judul, {lolos_lama} lolos filter, {lolos_judul} lolos dari judul saja "
+          f"({lolos_judul / args.jumlah:.0%} tidak butuh ringkasan)")
+    hasil = [
+        ("any(...) lama", lambda: filter_lama(data, lokasi_filter)),
+        ("PencocokBerita substring", lambda: filter_baru(data, substring)),
+        ("PencocokBerita batas kata", lambda: filter_baru(data, batas_kata)),
+    ]
+    acuan = None
+    for nama, fungsi in hasil:
+        detik = min(timeit.repeat(fungsi, number=1, repeat=args.ulang))
+        acuan = acuan or detik
+        print(f"{nama:<28} {detik * 1000:8.1f} ms  {detik / args.jumlah * 1e6:6.2f} us/judul  x{acuan / detik:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Benchmark pipeline scraping SKENA terhadap server berita tiruan (offline).
+
+Server tiruan (``server_berita.py``) dijalankan di proses terpisah, lalu satu
+job scraping lengkap (perencanaan query, SERP, ringkasan, filter, ekspor)
+dijalankan di proses ini lewat ``skena.job.jalankan_job`` dengan
+``SKENA_SEARCH_URL`` diarahkan ke server tersebut. Cache dan direktori job
+memakai direktori sementara sehingga run pertama selalu dingin; gunakan
+``--ulang 2`` untuk melihat run dengan cache hangat, atau ``--ulang 2
+--inkremental`` untuk run kedua yang hanya mencari rentang yang belum ada di
+arsip.
+
+Contoh::
+
+    python bench/bench_pipeline.py --kategori 4 --kata-kunci 8 --output bench.json
+
+Laporan berisi kata kunci/menit, link/detik, p50/p95 per tahap dan RSS puncak.
+Durasi per tahap dan penghitung diambil dari statistik bawaan job
+(``skena.statistik``), yang juga tersimpan di ``statistik.jsonl`` job.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from server_berita import Konfigurasi, mulai_server  # noqa: E402
+
+DAERAH = {
+    "Konawe Selatan": ["Andoolo", "Tinanggea", "Moramo", "Palangga", "Laeya"],
+    "Kolaka": ["Wundulako", "Pomalaa", "Latambaga"],
+    "Konawe": ["Unaaha", "Wawotobi", "Lambuya"],
+    "Muna": ["Katobu", "Tongkuno", "Kabawo"],
+}
+
+KOSAKATA = ["padi", "jagung", "kakao", "cengkeh", "rumput laut", "sapi", "ayam", "nikel", "harga", "produksi",
+            "panen", "nelayan", "pasar", "inflasi", "jalan", "pelabuhan", "bandara", "hotel", "sekolah", "puskesmas"]
+
+
+def _proses_server(konfigurasi, pipa):
+    url, _ = mulai_server(konfigurasi)
+    pipa.send(url)
+    while True:
+        time.sleep(3600)
+
+
+def buat_kata_kunci(jumlah_kategori, per_kategori):
+    """Sheet kata kunci sintetis; kata kunci sengaja berulang antar kategori."""
+    hasil = {}
+    for k in range(jumlah_kategori):
+        hasil[f"{chr(ord('A') + k % 26)}{k // 26 or ''}"] = [
+            KOSAKATA[(k * (per_kategori // 2) + i) % len(KOSAKATA)] + ("" if i % 3 else f" {k}")
+            for i in range(per_kategori)
+        ]
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline SKENA terhadap server berita tiruan.")
+    parser.add_argument("--kategori", type=int, default=3)
+    parser.add_argument("--kata-kunci", type=int, default=6, help="kata kunci per kategori")
+    parser.add_argument("--backend", default="http", choices=["http", "selenium"])
+    parser.add_argument("--worker", type=int, default=4)
+    parser.add_argument("--format", default="xlsx", choices=["xlsx", "csv", "parquet"])
+    parser.add_argument("--hasil", type=int, default=Konfigurasi.hasil_per_query, help="hasil per query")
+    parser.add_argument("--ukuran-artikel-kb", type=int, default=Konfigurasi.ukuran_artikel_kb)
+    parser.add_argument("--latensi-serp-ms", type=float, default=Konfigurasi.latensi_serp_ms)
+    parser.add_argument("--latensi-artikel-ms", type=float, default=Konfigurasi.latensi_artikel_ms)
+    parser.add_argument("--portal", type=int, default=Konfigurasi.jumlah_portal, help="jumlah host artikel")
+    parser.add_argument("--daerah", type=int, default=1, choices=range(1, len(DAERAH) + 1), help="jumlah daerah dalam satu job")
+    parser.add_argument("--duplikat", choices=["gabung", "lewati"], help="deteksi berita sindikasi (default: mati)")
+    parser.add_argument("--ambang-duplikat", type=float, default=0.8)
+    parser.add_argument("--rasio-sindikasi", type=float, default=Konfigurasi.rasio_sindikasi)
+    parser.add_argument("--rasio-429", type=float, default=Konfigurasi.rasio_429, help="porsi permintaan yang dibalas 429")
+    parser.add_argument("--laju-serp", type=float, help="laju awal SERP per detik (0 = tanpa batas); default mengikuti SKENA_LAJU_SERP")
+    parser.add_argument("--inkremental", action="store_true", help="run berikutnya hanya mencari rentang tanggal yang belum ada di arsip")
+    parser.add_argument("--ulang", type=int, default=1, help="jumlah run berturut-turut dengan cache yang sama")
+    parser.add_argument("--output", help="simpan laporan JSON ke berkas ini")
+    args = parser.parse_args()
+
+    konfigurasi = Konfigurasi(
+        hasil_per_query=args.hasil,
+        ukuran_artikel_kb=args.ukuran_artikel_kb,
+        latensi_serp_ms=args.latensi_serp_ms,
+        latensi_artikel_ms=args.latensi_artikel_ms,
+        jumlah_portal=args.portal,
+        rasio_429=args.rasio_429,
+        rasio_sindikasi=args.rasio_sindikasi,
+    )
+    pipa_terima, pipa_kirim = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=_proses_server, args=(konfigurasi, pipa_kirim), daemon=True)
+    server.start()
+    url = pipa_terima.recv()
+
+    sementara = tempfile.mkdtemp(prefix="skena-bench-")
+    os.environ.update({
+        "SKENA_SEARCH_URL": url,
+        "SKENA_CACHE_DIR": os.path.join(sementara, "cache"),
+        "SKENA_JOB_DIR": os.path.join(sementara, "job"),
+        "SKENA_ARSIP_DIR": os.path.join(sementara, "arsip"),
+    })
+    if args.laju_serp is not None:
+        os.environ["SKENA_LAJU_SERP"] = str(args.laju_serp)
+
+    # Import setelah environment diatur karena konfigurasi dibaca saat import
+    from skena import job
+    from skena.pencarian import rencanakan_daerah
+    from skena.statistik import PENGHITUNG
+
+    kata_kunci = buat_kata_kunci(args.kategori, args.kata_kunci)
+    parameter = {
+        "timestamp": time.strftime("%Y%m%d-%H%M%S"),
+        "label": "Benchmark",
+        "tanggal_awal": "1/1/2024",
+        "tanggal_akhir": "3/31/2024",
+        "daerah": dict(list(DAERAH.items())[:args.daerah]),
+        "kata_kunci": kata_kunci,
+        "backend": args.backend,
+        "jumlah_worker": args.worker,
+        "hemat_ringkasan": False,
+        "bypass_cache": False,
+        "format": args.format,
+        "duplikat": args.duplikat,
+        "ambang_duplikat": args.ambang_duplikat,
+        "inkremental": args.inkremental,
+    }
+    daftar_query, _ = rencanakan_daerah(kata_kunci, parameter["daerah"], "1/1/2024", "3/31/2024")
+
+    laporan = {"konfigurasi": {**vars(args), "server": vars(konfigurasi)}, "run": []}
+    rss_awal = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    for ke in range(1, args.ulang + 1):
+        job_id = job.buat_job(parameter)
+        mulai = time.perf_counter()
+        job.jalankan_job(job_id)
+        total = time.perf_counter() - mulai
+        status = job.baca_status(job_id)
+        statistik = status.get("statistik", {})
+
+        link = statistik.get("ringkasan_diambil", 0)
+        run = {
+            "run": ke,
+            "status": status["status"],
+            "detik": round(total, 3),
+            "kata_kunci": len(daftar_query),
+            "kata_kunci_per_menit": round(len(daftar_query) / total * 60, 1),
+            "link_diambil": link,
+            "link_per_detik": round(link / total, 1),
+            "baris_hasil": sum(status.get("jumlah_baris", {}).values()),
+            "rss_puncak_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "penghitung": {nama: statistik.get(nama, 0) for nama in PENGHITUNG},
+            "tahap": statistik.get("tahap", {}),
+        }
+        laporan["run"].append(run)
+
+        print(f"Run {ke}: {run['status']} dalam {run['detik']} detik | {run['kata_kunci']} kata kunci "
+              f"({run['kata_kunci_per_menit']}/menit) | {run['link_diambil']} link ({run['link_per_detik']}/detik) | "
+              f"{run['baris_hasil']} baris | RSS puncak {run['rss_puncak_mb']} MB (awal {rss_awal:.1f} MB)")
+        print("  " + " | ".join(f"{nama} {n}" for nama, n in run["penghitung"].items()))
+        print(f"  {'tahap':<18}{'n':>7}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}")
+        for tahap, t in run["tahap"].items():
+            print(f"  {tahap:<18}{t['n']:>7}{t['p50_ms']:>10}{t['p95_ms']:>10}{t['total_detik']:>10}")
+
+    server.terminate()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(laporan, f, ensure_ascii=False, indent=2)
+        print(f"Laporan disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
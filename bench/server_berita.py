@@ -0,0 +1,195 @@
+"""Server tiruan Google News (``tbm=nws``) dan portal berita untuk benchmark offline.
+
+Halaman pencarian memakai struktur yang dibaca SKENA (``div.SoaBEf``,
+``div.MBeuO``, ``div.OSrXXb > span`` dan tautan paginasi ``start=``).
+Artikel dilayani dari beberapa port sekaligus agar tiap port dihitung sebagai
+host berbeda oleh batas per-host di ``skena.ringkasan``. Semua isi
+deterministik terhadap query sehingga hasil antar run dapat dibandingkan.
+
+Sebagian berita (``rasio_sindikasi``) adalah salinan sindikasi: cerita
+yang sama di beberapa portal dengan URL berbeda dan judul berakhiran nama
+portal, untuk menguji deteksi berita serupa di ``skena.duplikat``.
+Dengan ``rasio_429`` sebagian permintaan dibalas 429 (dengan ``Retry-After``)
+untuk menguji pengaturan laju dan percobaan ulang.
+
+Dapat dijalankan sendiri: ``python bench/server_berita.py --port 8000``.
+"""
+import argparse
+import hashlib
+import html
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+WILAYAH = ["Konawe Selatan", "Andoolo", "Tinanggea", "Moramo", "Palangga", "Laeya"]
+KATA_JUDUL = ["warga", "pemerintah", "bupati", "petani", "nelayan", "pasar", "desa", "program", "bantuan", "jalan",
+              "produksi", "harga", "naik", "turun", "target", "capai", "resmikan", "tinjau", "dorong", "genjot",
+              "musim", "tahun", "ini", "baru", "kembali", "serentak", "hektare", "ton", "miliar", "pekan"]
+
+
+@dataclass
+class Konfigurasi:
+    hasil_per_query: int = 30
+    hasil_per_halaman: int = 10
+    rasio_relevan: float = 0.6
+    rasio_tumpang: float = 0.2
+    rasio_tanpa_meta: float = 0.2
+    ukuran_artikel_kb: int = 200
+    latensi_serp_ms: float = 300
+    latensi_artikel_ms: float = 150
+    jumlah_portal: int = 8
+    rasio_429: float = 0.0
+    rasio_sindikasi: float = 0.15
+
+
+def _angka(*bagian):
+    return int(hashlib.md5("|".join(map(str, bagian)).encode()).hexdigest()[:12], 16)
+
+
+def _judul(seed, awalan):
+    acak = random.Random(_angka("judul", seed))
+    return f"{awalan} " + " ".join(acak.sample(KATA_JUDUL, 6)).capitalize()
+
+
+def _tidur(ms, acak):
+    if ms > 0:
+        time.sleep(ms / 1000 * acak.uniform(0.5, 1.5))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    konfigurasi = Konfigurasi()
+    port_portal = []
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _kirim(self, isi, content_type="text/html; charset=utf-8", status=200):
+        data = isi.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        bagian = urlsplit(self.path)
+        param = parse_qs(bagian.query)
+        if self.konfigurasi.rasio_429 and random.random() < self.konfigurasi.rasio_429:
+            data = b"terlalu banyak permintaan"
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        if bagian.path == "/search":
+            self._serp(param.get("q", [""])[0], int(param.get("start", ["0"])[0]))
+        elif bagian.path.startswith("/artikel/"):
+            self._artikel(bagian.path.rsplit("/", 1)[-1])
+        else:
+            self._kirim("<html><body>tidak ditemukan</body></html>", status=404)
+
+    def _serp(self, q, start):
+        k = self.konfigurasi
+        acak = random.Random(_angka("serp", q, start))
+        _tidur(k.latensi_serp_ms, acak)
+
+        kartu = []
+        for i in range(start, min(start + k.hasil_per_halaman, k.hasil_per_query)):
+            acak_i = random.Random(_angka(q, i))
+            relevan = acak_i.random() < k.rasio_relevan
+            awalan = q if relevan else "Kabar daerah lain"
+            peluang = acak_i.random()
+            # Sebagian link diambil dari kumpulan bersama agar muncul di beberapa query
+            if peluang < k.rasio_tumpang:
+                id_artikel = f"bersama-{acak_i.randrange(200)}"
+                judul = _judul(id_artikel, awalan)
+            elif peluang < k.rasio_tumpang + k.rasio_sindikasi:
+                # Cerita yang sama dimuat ulang portal lain dengan URL dan akhiran judul berbeda
+                cerita = f"{_angka(q) % 10 ** 6}-{acak_i.randrange(4)}"
+                salinan = acak_i.randrange(len(self.port_portal))
+                id_artikel = f"sindikasi-{cerita}-{salinan}"
+                judul = f"{_judul(cerita, awalan)} - Portal{salinan}"
+            else:
+                id_artikel = f"{_angka(q) % 10 ** 8}-{i}"
+                judul = _judul(id_artikel, awalan)
+            port = self.port_portal[_angka(id_artikel) % len(self.port_portal)]
+            kartu.append(
+                f'<div class="SoaBEf"><div><a href="http://127.0.0.1:{port}/artikel/{id_artikel}">'
+                f'<div class="MBeuO">{html.escape(judul)}</div>'
+                f'<div class="OSrXXb"><span>{acak_i.randint(1, 28)} hari lalu</span></div></a></div></div>'
+            )
+
+        jumlah_halaman = -(-k.hasil_per_query // k.hasil_per_halaman)
+        paginasi = "".join(
+            f'<a href="/search?q={html.escape(q)}&amp;tbm=nws&amp;start={h * k.hasil_per_halaman}">{h + 1}</a>'
+            for h in range(jumlah_halaman) if h * k.hasil_per_halaman != start
+        )
+        self._kirim(f"<html><head><title>{html.escape(q)}</title></head><body><div id=\"topstuff\"></div><div id=\"rso\">{''.join(kartu)}</div>"
+                    f"<div id=\"botstuff\"><div role=\"navigation\">{paginasi}</div></div></body></html>")
+
+    def _artikel(self, id_artikel):
+        k = self.konfigurasi
+        if id_artikel.startswith("sindikasi-"):
+            # Semua salinan memuat isi yang sama
+            id_artikel = id_artikel.rsplit("-", 1)[0]
+        acak = random.Random(_angka("artikel", id_artikel))
+        _tidur(k.latensi_artikel_ms, acak)
+
+        wilayah = acak.choice(WILAYAH)
+        deskripsi = f"Warga {wilayah} membahas panen, harga dan produksi daerah dalam artikel {id_artikel}."
+        meta = "" if acak.random() < k.rasio_tanpa_meta else f'<meta name="description" content="{html.escape(deskripsi)}">'
+        isian = "<div>" + "lorem ipsum dolor sit amet " * 37 + "</div>"
+        jumlah_isian = max(1, k.ukuran_artikel_kb * 1024 // len(isian))
+        self._kirim(
+            f"<html><head><title>Artikel {id_artikel}</title>{meta}"
+            f"<script>{'var x = 1;' * 2000}</script></head><body><nav>menu</nav><p>{html.escape(deskripsi)}</p>"
+            + isian * jumlah_isian + "</body></html>"
+        )
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # ambil_ringkasan menutup koneksi begitu ringkasan ditemukan; itu bukan error
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+def mulai_server(konfigurasi=None, port=0):
+    """Menjalankan server SERP dan portal artikel di thread latar.
+
+    Mengembalikan ``(base_url_pencarian, daftar_server)``; panggil
+    ``shutdown()`` pada tiap server untuk menghentikannya.
+    """
+    konfigurasi = konfigurasi or Konfigurasi()
+    handler = type("Handler", (_Handler,), {"konfigurasi": konfigurasi, "port_portal": []})
+    server = [_Server(("127.0.0.1", port), handler)]
+    server += [_Server(("127.0.0.1", 0), handler) for _ in range(konfigurasi.jumlah_portal)]
+    handler.port_portal = [s.server_port for s in server[1:]] or [server[0].server_port]
+    for s in server:
+        threading.Thread(target=s.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server[0].server_port}/search", server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server tiruan Google News untuk benchmark SKENA.")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    url, _ = mulai_server(port=args.port)
+    print(f"SKENA_SEARCH_URL={url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
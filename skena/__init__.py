@@ -0,0 +1 @@
+"""Modul pendukung SKENA (Sistem Scraping Fenomena Konawe Selatan)."""
@@ -0,0 +1,155 @@
+"""Arsip hasil per (daerah, kata kunci) untuk refresh inkremental.
+
+Setiap pencarian yang tuntas dicatat sebagai satu segmen: rentang tanggal yang
+sudah tercakup beserta baris yang lolos filter. Rentang yang tercakup dipotong
+sampai kemarin (tanggal job dibuat), karena berita hari ini masih bisa
+bertambah. Run inkremental berikutnya hanya mencari bagian rentang yang belum
+tercakup segmen mana pun, lalu menggabungkan baris arsip dengan baris baru.
+
+Segmen hanya dipakai ulang jika seluruhnya berada di dalam rentang yang
+diminta dan dibuat dengan pengaturan filter yang sama (``jejak``); segmen yang
+hanya beririsan dianggap belum tercakup sehingga baris di luar rentang tidak
+ikut masuk.
+
+Agar arsip tidak terus membesar, segmen baru menggantikan segmen lain dengan
+jejak, daerah dan kata kunci yang sama yang seluruhnya berada di dalam
+rentangnya.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+from skena.filter import BATAS_KATA
+
+ARSIP_DIR = os.environ.get("SKENA_ARSIP_DIR", ".skena_arsip")
+
+FORMAT_TANGGAL = "%m/%d/%Y"
+
+
+def _tanggal(teks):
+    return datetime.strptime(teks, FORMAT_TANGGAL).date()
+
+
+def _teks(tanggal):
+    return tanggal.strftime(FORMAT_TANGGAL)
+
+
+def jejak_filter(kecamatan, hemat_ringkasan=False, mode_duplikat=None, ambang_duplikat=None, batas_kata=BATAS_KATA):
+    """Sidik pengaturan yang memengaruhi baris yang lolos; arsip hanya dipakai ulang jika sama."""
+    data = [sorted(kecamatan), bool(hemat_ringkasan), mode_duplikat, ambang_duplikat if mode_duplikat else None, bool(batas_kata)]
+    return hashlib.sha1(json.dumps(data).encode("utf-8")).hexdigest()[:16]
+
+
+def sisa_rentang(awal, akhir, tercakup):
+    """Bagian [awal, akhir] yang tidak tercakup daftar rentang ``tercakup`` (semua berupa date, inklusif)."""
+    sisa, mulai = [], awal
+    for a, b in sorted(tercakup):
+        if a > mulai:
+            sisa.append((mulai, min(a - timedelta(days=1), akhir)))
+        mulai = max(mulai, b + timedelta(days=1))
+        if mulai > akhir:
+            break
+    if mulai <= akhir:
+        sisa.append((mulai, akhir))
+    return sisa
+
+
+class Arsip:
+    """Segmen rentang tanggal yang sudah di-scrape beserta barisnya, disimpan di SQLite."""
+
+    def __init__(self, direktori=None):
+        direktori = direktori or ARSIP_DIR
+        os.makedirs(direktori, exist_ok=True)
+        self.path = os.path.join(direktori, "arsip.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS segmen ("
+            " id INTEGER PRIMARY KEY, jejak TEXT NOT NULL, daerah TEXT NOT NULL, keyword TEXT NOT NULL,"
+            " awal TEXT NOT NULL, akhir TEXT NOT NULL, generasi TEXT NOT NULL,"
+            " UNIQUE (jejak, daerah, keyword, awal, akhir, generasi))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS baris ("
+            " segmen INTEGER NOT NULL, urutan INTEGER NOT NULL, data TEXT NOT NULL,"
+            " PRIMARY KEY (segmen, urutan))"
+        )
+
+    def _segmen(self, jejak, daerah, keyword):
+        return self._conn.execute(
+            "SELECT id, awal, akhir FROM segmen WHERE jejak = ? AND daerah = ? AND keyword = ?",
+            (jejak, daerah.lower(), keyword.lower()),
+        ).fetchall()
+
+    def rencanakan(self, query, jejak):
+        """(daftar sub-Query untuk rentang yang belum tercakup, id segmen arsip yang dipakai).
+
+        Sub-Query pertama dan terakhir memakai teks tanggal asli ``query`` agar
+        run tanpa arsip identik dengan run biasa (kunci cache dan checkpoint sama).
+        """
+        awal, akhir = _tanggal(query.tanggal_awal), _tanggal(query.tanggal_akhir)
+        with self._lock:
+            dipakai = [
+                (id_segmen, _tanggal(a), _tanggal(b)) for id_segmen, a, b in self._segmen(jejak, query.daerah, query.keyword)
+                if awal <= _tanggal(a) and _tanggal(b) <= akhir
+            ]
+        sub = []
+        for a, b in sisa_rentang(awal, akhir, [(a, b) for _, a, b in dipakai]):
+            sub.append(query._replace(
+                tanggal_awal=query.tanggal_awal if a == awal else _teks(a),
+                tanggal_akhir=query.tanggal_akhir if b == akhir else _teks(b),
+            ))
+        return sub, [id_segmen for id_segmen, _, _ in dipakai]
+
+    def simpan(self, query, jejak, generasi, baris, hari_ini=None):
+        """Mencatat hasil satu (sub-)Query; rentangnya dianggap tercakup sampai sehari sebelum ``hari_ini``."""
+        hari_ini = hari_ini or date.today()
+        awal = _tanggal(query.tanggal_awal)
+        akhir = min(_tanggal(query.tanggal_akhir), hari_ini - timedelta(days=1))
+        if akhir < awal:
+            return
+        kunci = (jejak, query.daerah.lower(), query.keyword.lower(), _teks(awal), _teks(akhir), generasi)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO segmen (jejak, daerah, keyword, awal, akhir, generasi) VALUES (?, ?, ?, ?, ?, ?)", kunci
+                )
+                id_segmen = self._conn.execute(
+                    "SELECT id FROM segmen WHERE jejak = ? AND daerah = ? AND keyword = ? AND awal = ? AND akhir = ? AND generasi = ?", kunci
+                ).fetchone()[0]
+                tergantikan = [
+                    id_lama for id_lama, a, b in self._segmen(jejak, query.daerah, query.keyword)
+                    if id_lama != id_segmen and awal <= _tanggal(a) and _tanggal(b) <= akhir
+                ]
+                self._conn.executemany("DELETE FROM segmen WHERE id = ?", [(i,) for i in tergantikan])
+                self._conn.executemany("DELETE FROM baris WHERE segmen = ?", [(i,) for i in tergantikan + [id_segmen]])
+                self._conn.executemany(
+                    "INSERT INTO baris (segmen, urutan, data) VALUES (?, ?, ?)",
+                    [(id_segmen, i, json.dumps(b, ensure_ascii=False)) for i, b in enumerate(baris)],
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def baris(self, daftar_segmen):
+        """[(generasi, baris), ...] dari segmen yang diminta, urut generasi lalu tanggal awal."""
+        if not daftar_segmen:
+            return []
+        tanda = ", ".join("?" * len(daftar_segmen))
+        with self._lock:
+            segmen = self._conn.execute(f"SELECT id, awal, generasi FROM segmen WHERE id IN ({tanda})", list(daftar_segmen)).fetchall()
+            hasil = []
+            for id_segmen, awal, generasi in sorted(segmen, key=lambda s: (s[2], _tanggal(s[1]))):
+                data = self._conn.execute("SELECT data FROM baris WHERE segmen = ? ORDER BY urutan", (id_segmen,)).fetchall()
+                hasil.append((generasi, [json.loads(d) for (d,) in data]))
+        return hasil
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
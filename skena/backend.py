@@ -0,0 +1,183 @@
+"""Backend pengambil halaman hasil pencarian Google News (``tbm=nws``).
+
+Setiap backend menyediakan operasi yang dipakai ``skena.pencarian``:
+``ambil_pertama`` membuka halaman pertama sekali untuk membaca nilai
+``start=`` dari tautan paginasi sekaligus barisnya, dan ``ambil_halaman``
+membaca baris ``(link, judul, tanggal)`` dari halaman berikutnya. Semuanya
+memakai selector yang sama: ``div.SoaBEf``, ``div.MBeuO`` dan
+``div.OSrXXb > span``. Permintaan ke mesin pencari diatur lajunya dan diulang
+saat dibatasi lewat ``penjadwal_serp``.
+
+Halaman tanpa hasil hanya dilaporkan kosong (None) jika kerangka halaman
+hasil (``#topstuff``/``#botstuff``) terbaca. Halaman yang tidak selesai dimuat
+atau strukturnya tidak dikenal melempar ``HalamanTidakTerbaca``, sehingga
+rentang tanggalnya tidak dianggap sudah tercakup.
+"""
+import os
+import re
+import threading
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from skena import statistik
+from skena.pengaturan import BACKEND, JUMLAH_WORKER
+from skena.penjadwal import Penjadwal, PerluDiulang, periksa_respons
+
+USER_AGENT_BROWSER = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+POLA_START = re.compile(r"[?&]start=(\d+)")
+POLA_KERANGKA = re.compile(r"""id=["']?(?:topstuff|botstuff)\b""")
+
+# Laju awal dan maksimum (permintaan/detik) ke host pencarian; 0 berarti tanpa batas.
+LAJU_SERP = float(os.environ.get("SKENA_LAJU_SERP", 2.0))
+LAJU_SERP_MAKS = float(os.environ.get("SKENA_LAJU_SERP_MAKS", 5.0))
+
+# Dibagi semua backend dan worker agar laju ke satu host tetap terjaga.
+penjadwal_serp = Penjadwal(LAJU_SERP, kapasitas=2, laju_maks=LAJU_SERP_MAKS)
+
+
+class BackendGagal(Exception):
+    """Dilempar ketika backend pencarian tidak dapat dipakai sama sekali."""
+
+
+class HalamanTidakTerbaca(Exception):
+    """Halaman pencarian tidak selesai dimuat atau tidak dikenali sebagai halaman hasil."""
+
+
+class SearchBackend:
+    """Antarmuka backend pencarian."""
+
+    nama = ""
+
+    def __init__(self, jumlah=JUMLAH_WORKER):
+        self.jumlah = max(1, int(jumlah))
+
+    def ambil_pertama(self, url):
+        """Membuka halaman pertama sekali dan mengembalikan ``(daftar_start, baris)``.
+
+        ``daftar_start`` berisi nilai ``start`` paginasi (terurut, selalu memuat
+        0); ``baris`` sama seperti hasil ambil_halaman.
+        """
+        raise NotImplementedError
+
+    def ambil_halaman(self, url):
+        """Mengembalikan daftar ``(link, judul, tanggal)``, atau None jika halaman tidak memuat hasil."""
+        raise NotImplementedError
+
+    def tutup(self):
+        """Melepas sumber daya backend."""
+
+
+def parse_daftar_start(hrefs):
+    """Mengambil nilai ``start`` dari daftar href paginasi."""
+    start_values = {0}
+    for href in hrefs:
+        match = POLA_START.search(href or "")
+        if match:
+            start_values.add(int(match.group(1)))
+    return sorted(start_values)
+
+
+def parse_halaman_html(html, url=""):
+    """Membaca hasil pencarian dari HTML mentah; None jika tidak ada ``div.SoaBEf``."""
+    soup = BeautifulSoup(html, "html.parser")
+    results = soup.select("div.SoaBEf")
+    if not results:
+        return None
+    baris = []
+    for result in results:
+        link_element = result.find("a", href=True)
+        judul = result.select_one("div.MBeuO")
+        tanggal = result.select_one("div.OSrXXb > span")
+        if link_element is None or judul is None or tanggal is None:
+            continue
+        baris.append((urljoin(url, link_element["href"]), _teks(judul), _teks(tanggal)))
+    return baris
+
+
+def parse_start_html(html, url=""):
+    """Membaca nilai ``start`` dari tautan paginasi di HTML mentah."""
+    soup = BeautifulSoup(html, "html.parser")
+    return parse_daftar_start(urljoin(url, a["href"]) for a in soup.select('a[href*="start="]'))
+
+
+def adalah_halaman_blokir(url, html=""):
+    """True untuk halaman 'unusual traffic'/captcha Google."""
+    return "/sorry/" in (url or "") or 'id="captcha-form"' in html or "unusual traffic" in html
+
+
+def adalah_halaman_hasil(html):
+    """True jika HTML memuat hasil atau kerangka halaman hasil (termasuk halaman tanpa hasil)."""
+    html = html or ""
+    return "SoaBEf" in html or bool(POLA_KERANGKA.search(html))
+
+
+def _teks(element):
+    """Teks elemen dengan spasi dirapikan, mendekati ``WebElement.text``."""
+    return " ".join(element.get_text(" ").split())
+
+
+class HttpBackend(SearchBackend):
+    """Backend ringan tanpa browser: halaman diambil dengan requests dan diparse BeautifulSoup."""
+
+    nama = "http"
+    timeout = 10
+
+    def __init__(self, jumlah=JUMLAH_WORKER):
+        super().__init__(jumlah)
+        self._lokal = threading.local()
+        self._semua_session = []
+        self._lock = threading.Lock()
+
+    def _session(self):
+        session = getattr(self._lokal, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": USER_AGENT_BROWSER, "Accept-Language": "id,en;q=0.8"})
+            self._lokal.session = session
+            with self._lock:
+                self._semua_session.append(session)
+        return session
+
+    def _get(self, url):
+        return penjadwal_serp.jalankan(url, lambda: self._get_sekali(url), (PerluDiulang, HalamanTidakTerbaca, requests.ConnectionError, requests.Timeout))
+
+    def _get_sekali(self, url):
+        try:
+            with statistik.ukur("http_get"):
+                response = self._session().get(url, timeout=self.timeout)
+        except requests.Timeout:
+            statistik.hitung("timeout")
+            raise
+        periksa_respons(response)
+        if adalah_halaman_blokir(response.url, response.text):
+            raise PerluDiulang("Halaman blokir")
+        response.raise_for_status()
+        if not adalah_halaman_hasil(response.text):
+            raise HalamanTidakTerbaca("Struktur halaman hasil tidak dikenali")
+        return response.text
+
+    def ambil_pertama(self, url):
+        html = self._get(url)
+        return parse_start_html(html, url), parse_halaman_html(html, url)
+
+    def ambil_halaman(self, url):
+        return parse_halaman_html(self._get(url), url)
+
+    def tutup(self):
+        with self._lock:
+            semua, self._semua_session = self._semua_session, []
+        for session in semua:
+            session.close()
+
+
+def buat_backend(nama=BACKEND, jumlah=JUMLAH_WORKER):
+    """Membuat backend pencarian berdasarkan nama (``selenium`` atau ``http``)."""
+    if nama == "http":
+        return HttpBackend(jumlah)
+    if nama == "selenium":
+        from skena.browser import SeleniumBackend
+        return SeleniumBackend(jumlah)
+    raise ValueError(f"Backend pencarian tidak dikenal: {nama}")
@@ -0,0 +1,138 @@
+"""Backend pencarian berbasis Chrome headless (Selenium)."""
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from skena import statistik
+from skena.backend import JUMLAH_WORKER, BackendGagal, HalamanTidakTerbaca, SearchBackend, adalah_halaman_blokir, parse_daftar_start, penjadwal_serp
+from skena.penjadwal import PerluDiulang
+
+
+class BrowserGagalDimulai(BackendGagal):
+    """Dilempar ketika Chrome tidak dapat dijalankan."""
+
+
+def buat_driver():
+    """Menjalankan Chrome headless untuk membuka halaman hasil pencarian."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+    return webdriver.Chrome(options=chrome_options)
+
+
+class DriverPool:
+    """Kumpulan driver Chrome yang dipinjam bergantian oleh worker.
+
+    Driver dibuat saat pertama kali dibutuhkan (paling banyak ``jumlah``) dan
+    dipakai ulang antar pekerjaan sampai ``tutup`` dipanggil.
+    """
+
+    def __init__(self, jumlah=JUMLAH_WORKER, pembuat=buat_driver):
+        self.jumlah = max(1, int(jumlah))
+        self._pembuat = pembuat
+        self._bebas = queue.LifoQueue()
+        self._semua = []
+        self._lock = threading.Lock()
+        self._slot = threading.BoundedSemaphore(self.jumlah)
+
+    @contextmanager
+    def pinjam(self):
+        """Meminjam satu driver; driver dikembalikan ke pool setelah blok selesai."""
+        with self._slot:
+            try:
+                driver = self._bebas.get_nowait()
+            except queue.Empty:
+                try:
+                    driver = self._pembuat()
+                except Exception as e:
+                    raise BrowserGagalDimulai(f"Gagal memulai browser Chrome. Pastikan Chrome terinstal atau driver sudah benar. Error: {e}") from e
+                with self._lock:
+                    self._semua.append(driver)
+            try:
+                yield driver
+            finally:
+                self._bebas.put(driver)
+
+    def tutup(self):
+        """Menutup seluruh driver yang pernah dibuat."""
+        with self._lock:
+            semua, self._semua = self._semua, []
+        for driver in semua:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def _keadaan_halaman(driver):
+    """Kondisi WebDriverWait: 'blokir', 'hasil' atau 'kosong' begitu halaman siap dibaca, False jika belum."""
+    if adalah_halaman_blokir(driver.current_url) or driver.find_elements(By.ID, "captcha-form"):
+        return "blokir"
+    if driver.find_elements(By.CSS_SELECTOR, "div.SoaBEf"):
+        return "hasil"
+    # Halaman tanpa hasil tetap memuat kerangka #topstuff/#botstuff
+    if driver.execute_script("return document.readyState") == "complete" and driver.find_elements(By.CSS_SELECTOR, "#topstuff, #botstuff"):
+        return "kosong"
+    return False
+
+
+class SeleniumBackend(SearchBackend):
+    """Backend yang merender halaman pencarian di Chrome headless."""
+
+    nama = "selenium"
+    batas_tunggu = 10
+
+    def __init__(self, jumlah=JUMLAH_WORKER, pembuat=buat_driver):
+        super().__init__(jumlah)
+        self.pool = DriverPool(self.jumlah, pembuat)
+
+    def _buka(self, url, baca_start=False):
+        """Membuka satu halaman dan menunggu sampai siap dibaca, bukan jeda tetap."""
+        with self.pool.pinjam() as driver:
+            with statistik.ukur("selenium_get"):
+                driver.get(url)
+            try:
+                with statistik.ukur("selenium_tunggu"):
+                    keadaan = WebDriverWait(driver, self.batas_tunggu, poll_frequency=0.2).until(_keadaan_halaman)
+            except TimeoutException:
+                statistik.hitung("timeout")
+                raise HalamanTidakTerbaca(f"Halaman tidak siap dalam {self.batas_tunggu} detik")
+            if keadaan == "blokir":
+                raise PerluDiulang("Halaman blokir")
+
+            baris = self._baca_hasil(driver) if keadaan == "hasil" else None
+            if not baca_start:
+                return baris
+            pagination_links = driver.find_elements(By.XPATH, '//a[contains(@href, "start=")]')
+            return parse_daftar_start(link.get_attribute("href") for link in pagination_links), baris
+
+    def _baca_hasil(self, driver):
+        baris = []
+        for result in driver.find_elements(By.CSS_SELECTOR, "div.SoaBEf"):
+            try:
+                link = result.find_element(By.TAG_NAME, "a").get_attribute("href")
+                # Spasi dan baris baru dirapikan seperti parse_halaman_html
+                judul = " ".join(result.find_element(By.CSS_SELECTOR, "div.MBeuO").text.split())
+                tanggal = " ".join(result.find_element(By.CSS_SELECTOR, "div.OSrXXb > span").text.split())
+                baris.append((link, judul, tanggal))
+            except NoSuchElementException:
+                continue
+        return baris
+
+    def ambil_pertama(self, url):
+        return penjadwal_serp.jalankan(url, lambda: self._buka(url, baca_start=True), (PerluDiulang, HalamanTidakTerbaca))
+
+    def ambil_halaman(self, url):
+        return penjadwal_serp.jalankan(url, lambda: self._buka(url), (PerluDiulang, HalamanTidakTerbaca))
+
+    def tutup(self):
+        self.pool.tutup()
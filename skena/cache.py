@@ -0,0 +1,111 @@
+"""Cache persisten (SQLite) untuk ringkasan artikel dan hasil halaman pencarian."""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+CACHE_DIR = os.environ.get("SKENA_CACHE_DIR", ".skena_cache")
+CACHE_TTL = float(os.environ.get("SKENA_CACHE_TTL", 30 * 24 * 3600))
+CACHE_MAKS_MB = float(os.environ.get("SKENA_CACHE_MAKS_MB", 200))
+
+# Hasil pencarian untuk rentang tanggal yang belum berakhir masih bisa
+# bertambah, sehingga umurnya di cache dibuat jauh lebih pendek.
+SERP_TTL_TERBUKA = 6 * 3600
+
+
+def normalisasi_url(url):
+    """Menormalkan URL untuk kunci cache (host huruf kecil, tanpa fragmen dan parameter utm_*)."""
+    if not url:
+        return ""
+    bagian = urlsplit(url.strip())
+    query = urlencode([(k, v) for k, v in parse_qsl(bagian.query, keep_blank_values=True) if not k.lower().startswith("utm_")])
+    return urlunsplit((bagian.scheme.lower(), bagian.netloc.lower(), bagian.path or "/", query, ""))
+
+
+def kunci_serp(keyword, daerah, cd_min, cd_max, start=None):
+    """Menyusun kunci cache untuk satu halaman hasil pencarian."""
+    return json.dumps([keyword.lower(), daerah.lower(), cd_min, cd_max, start])
+
+
+class Cache:
+    """Cache key-value berbasis SQLite dengan TTL dan eviksi LRU berdasarkan ukuran.
+
+    Jika ``bypass`` bernilai True, pembacaan selalu dianggap miss tetapi hasil
+    baru tetap disimpan sehingga cache ikut diperbarui.
+    """
+
+    def __init__(self, direktori=None, ttl=CACHE_TTL, maks_bytes=int(CACHE_MAKS_MB * 1024 * 1024), bypass=False):
+        direktori = direktori or CACHE_DIR
+        os.makedirs(direktori, exist_ok=True)
+        self.path = os.path.join(direktori, "cache.sqlite3")
+        self.ttl = ttl
+        self.maks_bytes = maks_bytes
+        self.bypass = bypass
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entri ("
+            " ns TEXT NOT NULL, kunci TEXT NOT NULL, nilai TEXT NOT NULL,"
+            " dibuat REAL NOT NULL, diakses REAL NOT NULL, ukuran INTEGER NOT NULL,"
+            " PRIMARY KEY (ns, kunci))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entri_diakses ON entri (diakses)")
+        self._total = self._conn.execute("SELECT COALESCE(SUM(ukuran), 0) FROM entri").fetchone()[0]
+
+    def get(self, ns, kunci, ttl=None):
+        """Mengambil nilai dari cache, atau None jika tidak ada/kedaluwarsa."""
+        if self.bypass:
+            return None
+        ttl = self.ttl if ttl is None else ttl
+        sekarang = time.time()
+        with self._lock:
+            baris = self._conn.execute("SELECT nilai, dibuat FROM entri WHERE ns = ? AND kunci = ?", (ns, kunci)).fetchone()
+            if baris is None:
+                return None
+            if sekarang - baris[1] > ttl:
+                return None
+            self._conn.execute("UPDATE entri SET diakses = ? WHERE ns = ? AND kunci = ?", (sekarang, ns, kunci))
+        return json.loads(baris[0])
+
+    def set(self, ns, kunci, nilai):
+        """Menyimpan nilai (harus bisa di-serialisasi JSON) ke cache."""
+        data = json.dumps(nilai, ensure_ascii=False)
+        ukuran = len(data.encode("utf-8")) + len(kunci)
+        sekarang = time.time()
+        with self._lock:
+            lama = self._conn.execute("SELECT ukuran FROM entri WHERE ns = ? AND kunci = ?", (ns, kunci)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entri (ns, kunci, nilai, dibuat, diakses, ukuran) VALUES (?, ?, ?, ?, ?, ?)",
+                (ns, kunci, data, sekarang, sekarang, ukuran),
+            )
+            self._total += ukuran - (lama[0] if lama else 0)
+            if self._total > self.maks_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Menghapus entri yang paling lama tidak diakses hingga ukuran turun ke 90% batas."""
+        target = int(self.maks_bytes * 0.9)
+        hapus = []
+        for ns, kunci, ukuran in self._conn.execute("SELECT ns, kunci, ukuran FROM entri ORDER BY diakses"):
+            if self._total <= target:
+                break
+            hapus.append((ns, kunci))
+            self._total -= ukuran
+        self._conn.executemany("DELETE FROM entri WHERE ns = ? AND kunci = ?", hapus)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def ttl_serp(cd_max, ttl=CACHE_TTL):
+    """TTL hasil pencarian: pendek jika rentang tanggal (format m/d/Y) belum berakhir."""
+    try:
+        akhir = datetime.strptime(cd_max, "%m/%d/%Y").date()
+    except (TypeError, ValueError):
+        return SERP_TTL_TERBUKA
+    return ttl if akhir < date.today() else SERP_TTL_TERBUKA
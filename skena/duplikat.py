@@ -0,0 +1,86 @@
+"""Indeks judul berita yang hampir sama (MinHash + LSH).
+
+Berita daerah banyak disindikasikan: cerita yang sama muncul di beberapa
+portal dengan URL berbeda dan judul yang hanya beda sedikit (mis. akhiran
+nama portal). Judul dinormalisasi, dipecah menjadi shingle karakter, lalu
+diringkas menjadi signature MinHash. LSH (band signature) mencari kandidat
+dalam waktu hampir konstan, dan kandidat dipastikan dengan perkiraan
+kemiripan Jaccard dari signature terhadap ``ambang``.
+
+Satu indeks dipakai bersama selama run agar salinan memakai ringkasan
+wakilnya; indeks terpisah per kategori dan daerah dipakai saat menentukan
+salinan yang digabung atau dibuang (``gabungkan_kategori``).
+"""
+import hashlib
+import os
+import random
+import re
+import threading
+
+AMBANG = float(os.environ.get("SKENA_AMBANG_DUPLIKAT", 0.8))
+JUMLAH_HASH = 64
+PANJANG_SHINGLE = 4
+
+_PRIMA = (1 << 61) - 1
+_acak = random.Random(20250101)
+_KOEFISIEN = [(_acak.randrange(1, _PRIMA), _acak.randrange(0, _PRIMA)) for _ in range(JUMLAH_HASH)]
+
+# Akhiran nama portal seperti " - Kompas.com" atau " | detikSulsel"
+_POLA_AKHIRAN = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,40}$")
+_POLA_BUKAN_HURUF = re.compile(r"[^0-9a-z]+")
+
+
+def normalisasi_judul(judul):
+    """Huruf kecil tanpa tanda baca dan tanpa akhiran nama portal."""
+    judul = _POLA_AKHIRAN.sub("", (judul or "").strip())
+    return _POLA_BUKAN_HURUF.sub(" ", judul.lower()).strip()
+
+
+def signature(judul):
+    """Signature MinHash dari shingle karakter judul yang sudah dinormalisasi."""
+    teks = normalisasi_judul(judul)
+    if len(teks) <= PANJANG_SHINGLE:
+        shingle = {teks}
+    else:
+        shingle = {teks[i:i + PANJANG_SHINGLE] for i in range(len(teks) - PANJANG_SHINGLE + 1)}
+    nilai = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingle]
+    return tuple(min((a * x + b) % _PRIMA for x in nilai) for a, b in _KOEFISIEN)
+
+
+def _pilih_band(ambang, jumlah_hash=JUMLAH_HASH):
+    """Jumlah band sehingga ambang LSH (1/b)^(1/r) paling dekat ke ``ambang``."""
+    pilihan = [b for b in range(1, jumlah_hash + 1) if jumlah_hash % b == 0]
+    return min(pilihan, key=lambda b: abs((1 / b) ** (b / jumlah_hash) - ambang))
+
+
+class IndeksJudul:
+    """Indeks judul yang sudah dilihat; tiap kelompok judul mirip diwakili link pertamanya."""
+
+    def __init__(self, ambang=AMBANG):
+        self.ambang = ambang
+        self.jumlah_band = _pilih_band(ambang)
+        self.baris_per_band = JUMLAH_HASH // self.jumlah_band
+        self._band = [{} for _ in range(self.jumlah_band)]
+        self._signature = {}
+        self._lock = threading.Lock()
+
+    def _kunci_band(self, sig):
+        r = self.baris_per_band
+        return [sig[i * r:(i + 1) * r] for i in range(self.jumlah_band)]
+
+    def wakil(self, judul, link):
+        """Link wakil kelompok judul ini; judul baru didaftarkan dengan ``link`` sebagai wakilnya."""
+        sig = signature(judul)
+        kunci = self._kunci_band(sig)
+        with self._lock:
+            if link in self._signature:
+                return link
+            kandidat = dict.fromkeys(w for band, k in zip(self._band, kunci) for w in band.get(k, ()))
+            for wakil in kandidat:
+                sama = sum(x == y for x, y in zip(sig, self._signature[wakil])) / JUMLAH_HASH
+                if sama >= self.ambang:
+                    return wakil
+            self._signature[link] = sig
+            for band, k in zip(self._band, kunci):
+                band.setdefault(k, []).append(link)
+            return link
@@ -0,0 +1,194 @@
+"""Penulisan hasil scraping ke berkas secara bertahap (memori konstan).
+
+Setiap penulis menerima hasil satu kategori sekaligus lewat ``tulis_kategori``
+dan langsung menuliskannya ke berkas sementara, sehingga baris kategori yang
+sudah ditulis tidak perlu disimpan di memori. ``tutup`` memindahkan berkas
+sementara ke path akhir dan mengembalikan False jika tidak ada baris sama sekali.
+Pada job beberapa daerah (``per_daerah=True``) Excel memakai satu sheet per
+daerah dan kategori, sedangkan CSV dan Parquet mendapat kolom Daerah.
+Statistik durasi dan penghitung job (``tulis_statistik``) hanya disimpan oleh
+penulis Excel sebagai sheet terakhir; format lain cukup memakai log
+``statistik.jsonl`` di direktori job.
+"""
+import csv
+import os
+
+KOLOM = ["Nomor", "Kata Kunci", "Judul", "Link", "Tanggal", "Ringkasan"]
+# Link salinan sindikasi yang digabung ke satu baris (skena.duplikat)
+KOLOM_SUMBER_LAIN = "Sumber Lain"
+
+FORMAT = {
+    "xlsx": ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV", "text/csv"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet"),
+}
+
+
+SHEET_STATISTIK = "Statistik"
+
+
+def nama_sheet(kategori, daerah=None):
+    """Nama sheet Excel untuk sebuah kategori (maksimal 31 karakter)."""
+    nama = f"Kategori {kategori}"
+    if daerah:
+        # Nama daerah yang dipotong lebih dulu agar kategori tetap terbaca
+        nama = f"{daerah[:max(12, 28 - len(nama))]} - {nama}"
+    return nama[:31]
+
+
+class PenulisHasil:
+    """Dasar penulis hasil; turunan cukup mengisi ``_buka``, ``_tulis`` dan ``_simpan``."""
+
+    ekstensi = ""
+
+    def __init__(self, path, per_daerah=False, kolom=KOLOM):
+        self.path = path
+        self.per_daerah = per_daerah
+        self.kolom = list(kolom)
+        self._sementara = f"{path}.tmp"
+        self.jumlah_baris = 0
+        self._buka()
+
+    def _buka(self):
+        raise NotImplementedError
+
+    def _tulis(self, kategori, baris, daerah):
+        raise NotImplementedError
+
+    def _simpan(self):
+        raise NotImplementedError
+
+    def tulis_kategori(self, kategori, baris, daerah=None):
+        if baris:
+            self._tulis(kategori, baris, daerah)
+            self.jumlah_baris += len(baris)
+
+    def tulis_statistik(self, baris):
+        """Menyimpan baris statistik job; dipanggil sekali setelah semua kategori ditulis."""
+
+    def tutup(self):
+        """Menyelesaikan berkas; True jika ada baris yang ditulis."""
+        self._simpan()
+        if not self.jumlah_baris:
+            if os.path.exists(self._sementara):
+                os.remove(self._sementara)
+            return False
+        os.replace(self._sementara, self.path)
+        return True
+
+    def batal(self):
+        """Membuang berkas sementara (mis. job dihentikan sebelum semua kategori selesai)."""
+        self.jumlah_baris = 0
+        self.tutup()
+
+
+class PenulisExcel(PenulisHasil):
+    """Workbook openpyxl mode write-only, satu sheet per kategori."""
+
+    ekstensi = "xlsx"
+
+    def _buka(self):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, Side
+
+        self._wb = Workbook(write_only=True)
+        self._WriteOnlyCell = WriteOnlyCell
+        # Gaya header disamakan dengan DataFrame.to_excel
+        tipis = Side(style="thin")
+        self._font = Font(bold=True)
+        self._border = Border(left=tipis, right=tipis, top=tipis, bottom=tipis)
+        self._alignment = Alignment(horizontal="center", vertical="top")
+        self._nama_terpakai = set()
+
+    def _header(self, ws, kolom):
+        sel = []
+        for nama in kolom:
+            cell = self._WriteOnlyCell(ws, value=nama)
+            cell.font, cell.border, cell.alignment = self._font, self._border, self._alignment
+            sel.append(cell)
+        return sel
+
+    def _sheet(self, judul, baris):
+        # Nama daerah yang terpotong bisa bertabrakan; beri nomor agar tetap unik
+        nama, ke = judul, 2
+        while nama.lower() in self._nama_terpakai:
+            akhiran = f" ({ke})"
+            nama, ke = judul[:31 - len(akhiran)] + akhiran, ke + 1
+        self._nama_terpakai.add(nama.lower())
+        ws = self._wb.create_sheet(nama)
+        # Baris statistik tidak selalu memiliki kolom tahap yang sama
+        kolom = list(dict.fromkeys(k for b in baris for k in b))
+        ws.append(self._header(ws, kolom))
+        for b in baris:
+            ws.append([b.get(k) for k in kolom])
+
+    def _tulis(self, kategori, baris, daerah):
+        self._sheet(nama_sheet(kategori, daerah if self.per_daerah else None), baris)
+
+    def tulis_statistik(self, baris):
+        if baris and self.jumlah_baris:
+            self._sheet(SHEET_STATISTIK, baris)
+
+    def _simpan(self):
+        if self.jumlah_baris:
+            self._wb.save(self._sementara)
+        self._wb = None
+
+
+class PenulisCsv(PenulisHasil):
+    """Satu berkas CSV (UTF-8 dengan BOM agar terbaca Excel) dengan kolom Kategori di depan."""
+
+    ekstensi = "csv"
+
+    def _buka(self):
+        self._f = open(self._sementara, "w", newline="", encoding="utf-8-sig")
+        kolom_depan = ["Daerah", "Kategori"] if self.per_daerah else ["Kategori"]
+        self._writer = csv.DictWriter(self._f, fieldnames=kolom_depan + self.kolom, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def _tulis(self, kategori, baris, daerah):
+        self._writer.writerows({"Daerah": daerah, "Kategori": kategori, **b} for b in baris)
+        self._f.flush()
+
+    def _simpan(self):
+        self._f.close()
+
+
+class PenulisParquet(PenulisHasil):
+    """Berkas Parquet (pyarrow), satu row group per kategori, dengan kolom Kategori di depan."""
+
+    ekstensi = "parquet"
+
+    def _buka(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Ekspor Parquet membutuhkan paket pyarrow.") from e
+        self._pa = pa
+        kolom_depan = [("Daerah", pa.string())] if self.per_daerah else []
+        self._schema = pa.schema(
+            kolom_depan + [("Kategori", pa.string()), ("Nomor", pa.int64())] + [(k, pa.string()) for k in self.kolom if k != "Nomor"]
+        )
+        self._writer = pq.ParquetWriter(self._sementara, self._schema)
+
+    def _tulis(self, kategori, baris, daerah):
+        data = [{"Daerah": daerah, "Kategori": str(kategori), **{k: b.get(k) for k in self.kolom}} for b in baris]
+        self._writer.write_table(self._pa.Table.from_pylist(data, schema=self._schema))
+
+    def _simpan(self):
+        self._writer.close()
+
+
+_PENULIS = {kelas.ekstensi: kelas for kelas in (PenulisExcel, PenulisCsv, PenulisParquet)}
+
+
+def buat_penulis(format_hasil, path_tanpa_ekstensi, per_daerah=False, kolom=KOLOM):
+    """Membuat penulis hasil untuk format ``xlsx``, ``csv`` atau ``parquet``.
+
+    ``kolom`` menentukan kolom CSV/Parquet; sheet Excel mengikuti isi baris.
+    """
+    if format_hasil not in _PENULIS:
+        raise ValueError(f"Format hasil tidak dikenal: {format_hasil}")
+    return _PENULIS[format_hasil](f"{path_tanpa_ekstensi}.{format_hasil}", per_daerah, kolom)
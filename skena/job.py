@@ -0,0 +1,512 @@
+"""Job scraping yang berjalan di proses worker terpisah dari skrip Streamlit.
+
+Tiap job disimpan di ``SKENA_JOB_DIR/<job_id>/``:
+
+- ``job.json``        parameter run (tanggal, kata kunci, daerah beserta
+  kecamatannya, backend, ...)
+- ``status.json``     progres yang dibaca halaman Streamlit secara berkala
+- ``checkpoint.jsonl`` unit yang sudah selesai (daftar halaman, baris per
+  halaman, dan query yang tuntas), satu JSON per baris
+- ``hasil.<format>``  hasil (xlsx, csv atau parquet), ditulis bertahap setiap
+  kali semua kata kunci sebuah kategori (per daerah) selesai
+- ``statistik.jsonl`` durasi per tahap dan penghitung per kata kunci, lalu
+  ringkasan per kategori dan total saat job selesai
+- ``rencana_arsip.json`` pembagian tiap query menjadi sub-rentang tanggal dan
+  segmen arsip yang dipakai ulang (lihat ``skena.arsip``)
+
+Direktori job yang sudah selesai dihapus setelah ``SKENA_JOB_UMUR_HARI`` hari
+(dibersihkan setiap kali job baru dibuat); job yang belum selesai disimpan
+sampai dilanjutkan.
+
+Worker dijalankan dengan ``python -m skena.job <job_id>``. Menjalankan ulang
+worker untuk job yang terputus akan melanjutkan dari checkpoint terakhir.
+Unit checkpoint adalah (kata kunci, halaman) dan bukan (kategori, kata kunci,
+halaman), karena sejak query dideduplikasi satu pencarian dipakai bersama oleh
+semua kategori; baris per kategori baru disusun saat job selesai.
+
+Satu job dapat mencakup beberapa daerah. Semua pasangan (daerah, kata kunci)
+dijadwalkan ke backend, cache dan memo ringkasan yang sama, sehingga browser
+hanya dijalankan sekali dan berita yang muncul di beberapa daerah cukup
+diambil ringkasannya sekali.
+
+Pada mode inkremental, hasil setiap pencarian dicatat ke arsip dan query
+hanya dijalankan untuk rentang tanggal yang belum tercakup arsip; baris arsip
+digabung di depan baris baru sehingga ``Nomor`` berita lama tidak bergeser.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import date
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+JOB_DIR = os.environ.get("SKENA_JOB_DIR", ".skena_jobs")
+# Job selesai yang lebih tua dari ini dihapus (checkpoint dan berkas hasil)
+JOB_UMUR_HARI = float(os.environ.get("SKENA_JOB_UMUR_HARI", 14))
+MAKS_LOG = 100
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Proses worker yang dijalankan dari proses Streamlit ini; poll() dipakai untuk
+# mendeteksi worker yang sudah mati (sekaligus mencegah proses zombie).
+_proses = {}
+
+
+def _path(job_id, nama=""):
+    return os.path.join(JOB_DIR, job_id, nama)
+
+
+def _tulis_json(path, data):
+    """Menulis JSON secara atomik agar pembaca tidak pernah melihat berkas setengah jadi."""
+    sementara = f"{path}.{os.getpid()}.tmp"
+    with open(sementara, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(sementara, path)
+
+
+def _baca_json(path, default=None):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _kunci_query(query):
+    return json.dumps(list(query), ensure_ascii=False)
+
+
+class Checkpoint:
+    """Catatan unit kerja yang sudah selesai, disimpan append-only di ``checkpoint.jsonl``."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._daftar_start = {}
+        self._halaman = {}
+        self._selesai = {}
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                isi = f.read()
+            utuh = isi[:isi.rfind(b"\n") + 1]
+            if len(utuh) < len(isi):
+                # Baris terakhir terpotong karena worker mati saat menulis; sisanya
+                # dibuang agar entri berikutnya tidak tersambung ke baris itu
+                with open(path, "r+b") as f:
+                    f.truncate(len(utuh))
+            for baris in utuh.decode("utf-8", errors="replace").splitlines():
+                try:
+                    self._terapkan(json.loads(baris))
+                except ValueError:
+                    continue
+
+    def _terapkan(self, entri):
+        kunci = entri["query"]
+        if entri["jenis"] == "daftar_start":
+            self._daftar_start[kunci] = entri["start"]
+        elif entri["jenis"] == "halaman":
+            self._halaman.setdefault(kunci, {})[entri["start"]] = (entri["baris"], entri.get("dilihat", []))
+        elif entri["jenis"] == "query":
+            # Baris per halaman tidak dibutuhkan lagi setelah query tuntas
+            self._halaman.pop(kunci, None)
+            self._selesai[kunci] = (entri["baris"], [tuple(c) for c in entri["catatan"]])
+
+    def _tambah(self, entri):
+        with self._lock:
+            self._terapkan(entri)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entri, ensure_ascii=False) + "\n")
+
+    def daftar_start(self, query):
+        return self._daftar_start.get(_kunci_query(query))
+
+    def catat_daftar_start(self, query, start_values):
+        if self.daftar_start(query) is None:
+            self._tambah({"jenis": "daftar_start", "query": _kunci_query(query), "start": list(start_values)})
+
+    def halaman(self, query, start):
+        return self._halaman.get(_kunci_query(query), {}).get(start, (None,))[0]
+
+    def dilihat(self, query, start):
+        """Pasangan ``[link, judul]`` yang diperiksa di halaman itu (untuk membangun ulang indeks judul)."""
+        return self._halaman.get(_kunci_query(query), {}).get(start, (None, []))[1]
+
+    def catat_halaman(self, query, start, baris, dilihat=()):
+        self._tambah({"jenis": "halaman", "query": _kunci_query(query), "start": start, "baris": baris, "dilihat": [list(d) for d in dilihat]})
+
+    def selesai(self, query):
+        """(baris, catatan) untuk query yang sudah tuntas, atau None."""
+        return self._selesai.get(_kunci_query(query))
+
+    def catat_selesai(self, query, baris, catatan):
+        self._tambah({"jenis": "query", "query": _kunci_query(query), "baris": baris, "catatan": [list(c) for c in catatan]})
+
+    def lepas(self, query):
+        """Membuang baris query dari memori (berkas checkpoint tidak berubah)."""
+        kunci = _kunci_query(query)
+        if kunci in self._selesai:
+            self._selesai[kunci] = ((), self._selesai[kunci][1])
+
+
+# --- Sisi Streamlit ---
+
+def buat_job(parameter):
+    """Menyimpan parameter job baru dan mengembalikan job_id."""
+    bersihkan_job()
+    job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    os.makedirs(_path(job_id), exist_ok=True)
+    _tulis_json(_path(job_id, "job.json"), parameter)
+    _tulis_json(_path(job_id, "status.json"), {"status": "menunggu", "selesai": 0, "total": 0, "durasi_detik": 0, "log": []})
+    return job_id
+
+
+def jalankan_di_latar(job_id):
+    """Menjalankan worker untuk job (baru atau lanjutan) di proses terpisah."""
+    berhenti = _path(job_id, "berhenti")
+    if os.path.exists(berhenti):
+        os.remove(berhenti)
+    status = _baca_json(_path(job_id, "status.json"), {})
+    status.update({"status": "menunggu", "pid": None})
+    _tulis_json(_path(job_id, "status.json"), status)
+    with open(_path(job_id, "worker.log"), "ab") as log:
+        proses = subprocess.Popen(
+            [sys.executable, "-m", "skena.job", job_id],
+            cwd=_ROOT,
+            env={**os.environ, "SKENA_JOB_DIR": os.path.abspath(JOB_DIR)},
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+            start_new_session=True,
+        )
+    _proses[job_id] = proses
+    return proses.pid
+
+
+def _proses_hidup(job_id, pid):
+    proses = _proses.get(job_id)
+    if proses is not None and (pid is None or proses.pid == pid):
+        return proses.poll() is None
+    if pid is None:
+        return True
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+
+def baca_status(job_id):
+    """Membaca status job; job 'berjalan' yang workernya sudah mati dilaporkan 'terputus'."""
+    status = _baca_json(_path(job_id, "status.json"))
+    if status is None:
+        return None
+    if status.get("status") in ("menunggu", "berjalan") and not _proses_hidup(job_id, status.get("pid")):
+        status["status"] = "terputus"
+    return status
+
+
+def baca_parameter(job_id):
+    return _baca_json(_path(job_id, "job.json"))
+
+
+def daftar_job(batas=10, belum_selesai=False):
+    """Daftar (job_id, status) terbaru, paling baru lebih dulu.
+
+    Dengan ``belum_selesai=True`` hanya job yang belum selesai yang dihitung,
+    sehingga job yang bisa dilanjutkan tidak tergeser oleh job selesai yang lebih baru.
+    """
+    if not os.path.isdir(JOB_DIR):
+        return []
+    hasil = []
+    for job_id in sorted(os.listdir(JOB_DIR), reverse=True):
+        if len(hasil) >= batas:
+            break
+        status = baca_status(job_id)
+        if status is None or (belum_selesai and status["status"] == "selesai"):
+            continue
+        hasil.append((job_id, status))
+    return hasil
+
+
+def bersihkan_job(umur_hari=JOB_UMUR_HARI):
+    """Menghapus direktori job selesai yang status terakhirnya lebih tua dari ``umur_hari``."""
+    if umur_hari <= 0 or not os.path.isdir(JOB_DIR):
+        return
+    batas = time.time() - umur_hari * 24 * 3600
+    for job_id in os.listdir(JOB_DIR):
+        path_status = _path(job_id, "status.json")
+        try:
+            if os.path.getmtime(path_status) >= batas:
+                continue
+        except OSError:
+            continue
+        if (_baca_json(path_status) or {}).get("status") == "selesai":
+            shutil.rmtree(_path(job_id), ignore_errors=True)
+
+
+def hentikan_job(job_id):
+    """Meminta worker berhenti setelah unit yang sedang berjalan selesai; job bisa dilanjutkan lagi."""
+    open(_path(job_id, "berhenti"), "w").close()
+
+
+def path_hasil(job_id, format_hasil="xlsx"):
+    return _path(job_id, f"hasil.{format_hasil}")
+
+
+# --- Sisi worker ---
+
+class _Status:
+    """Status job di sisi worker; setiap perubahan langsung ditulis ke status.json."""
+
+    def __init__(self, job_id):
+        self.path = _path(job_id, "status.json")
+        self.data = _baca_json(self.path, {})
+        self.data.update({"status": "berjalan", "pid": os.getpid()})
+        self.data.setdefault("log", [])
+        self._durasi_awal = self.data.get("durasi_detik", 0)
+        self._mulai = time.time()
+        self._lock = threading.Lock()
+        self.tulis()
+
+    def log(self, pesan):
+        with self._lock:
+            self.data["log"] = (self.data["log"] + [pesan])[-MAKS_LOG:]
+
+    def tulis(self, **perubahan):
+        with self._lock:
+            self.data.update(perubahan)
+            self.data["durasi_detik"] = self._durasi_awal + (time.time() - self._mulai)
+            _tulis_json(self.path, self.data)
+
+
+def jalankan_job(job_id):
+    """Menjalankan (atau melanjutkan) job hingga selesai; dipanggil di proses worker."""
+    from skena.arsip import Arsip, jejak_filter
+    from skena.backend import BackendGagal, buat_backend
+    from skena.cache import Cache
+    from skena.duplikat import AMBANG
+    from skena.ekspor import KOLOM, KOLOM_SUMBER_LAIN, buat_penulis
+    from skena.filter import PencocokBerita
+    from skena.pencarian import Query, cari_berita_keyword, gabungkan_kategori, rencanakan_daerah
+    from skena.statistik import Statistik, baris_sheet
+
+    p = baca_parameter(job_id)
+    status = _Status(job_id)
+    checkpoint = Checkpoint(_path(job_id, "checkpoint.jsonl"))
+    statistik = Statistik(_path(job_id, "statistik.jsonl"))
+
+    daerah = p["daerah"]
+    per_daerah = len(daerah) > 1
+    statistik.muat_log()
+    daftar_query, rencana_kategori = rencanakan_daerah(p["kata_kunci"], list(daerah), p["tanggal_awal"], p["tanggal_akhir"])
+    mode_duplikat = p.get("duplikat")
+
+    arsip = None
+    if p.get("inkremental"):
+        try:
+            arsip = Arsip()
+        except Exception as e:
+            status.log(f"Arsip tidak dapat dibuka, seluruh rentang tanggal dicari ulang tanpa dicatat. Error: {e}")
+    jejak = {nama: jejak_filter(kecamatan, p.get("hemat_ringkasan", False), mode_duplikat, p.get("ambang_duplikat", AMBANG)) for nama, kecamatan in daerah.items()}
+
+    # Pembagian query menjadi sub-rentang disimpan saat job pertama kali
+    # berjalan, sehingga job yang dilanjutkan memakai pembagian (dan kunci
+    # checkpoint) yang sama walaupun arsip sudah bertambah.
+    rencana_arsip = _baca_json(_path(job_id, "rencana_arsip.json"))
+    rencana_baru = rencana_arsip is None
+    if rencana_baru:
+        rencana_arsip = {"hari_ini": date.today().isoformat(), "query": {}}
+        for query in daftar_query:
+            sub, segmen = [query], []
+            if arsip is not None:
+                sub, segmen = arsip.rencanakan(query, jejak[query.daerah])
+            rencana_arsip["query"][_kunci_query(query)] = {"sub": [list(s) for s in sub], "segmen": segmen}
+        _tulis_json(_path(job_id, "rencana_arsip.json"), rencana_arsip)
+    hari_ini = date.fromisoformat(rencana_arsip["hari_ini"])
+    sub_query = {query: [Query(*s) for s in rencana_arsip["query"][_kunci_query(query)]["sub"]] for query in daftar_query}
+    induk = {sub: query for query, daftar_sub in sub_query.items() for sub in daftar_sub}
+    hasil_lama = {}
+    if arsip is not None:
+        hasil_lama = {query: arsip.baris(rencana_arsip["query"][_kunci_query(query)]["segmen"]) for query in daftar_query}
+    if p.get("inkremental") and rencana_baru:
+        utuh = sum(not daftar_sub for daftar_sub in sub_query.values())
+        status.log(f"Refresh inkremental: {utuh} dari {len(daftar_query)} pencarian sudah tercakup arsip, {len(induk)} pencarian untuk rentang baru.")
+
+    # Query selesai jika semua sub-rentangnya selesai; barisnya digabung dari
+    # tiap sub-rentang (baris arsip ditambahkan saat kategori disusun).
+    hasil_sub = {}
+    for sub in induk:
+        tersimpan = checkpoint.selesai(sub)
+        if tersimpan is not None:
+            hasil_sub[sub] = tersimpan[0]
+    hasil_query = {}
+
+    def kumpulkan(query):
+        if query not in hasil_query and all(sub in hasil_sub for sub in sub_query[query]):
+            hasil_query[query] = [baris for sub in sub_query[query] for baris in hasil_sub[sub]]
+            return True
+        return False
+
+    for query in daftar_query:
+        kumpulkan(query)
+    sisa = [sub for sub in induk if sub not in hasil_sub]
+    if hasil_sub:
+        status.log(f"Melanjutkan dari checkpoint: {len(hasil_sub)} dari {len(induk)} pencarian sudah selesai.")
+    status.tulis(total=len(induk), selesai=len(hasil_sub))
+
+    try:
+        cache = Cache(bypass=p.get("bypass_cache", False))
+    except Exception as e:
+        cache = None
+        status.log(f"Cache tidak dapat dibuka, scraping berjalan tanpa cache. Error: {e}")
+
+    try:
+        backend = buat_backend(p.get("backend"), p.get("jumlah_worker", 1))
+    except Exception as e:
+        status.tulis(status="gagal", pesan=f"Backend pencarian '{p.get('backend')}' tidak dapat digunakan. Error: {e}")
+        return
+
+    pencocok = {nama: PencocokBerita.dari_daerah(nama, kecamatan) for nama, kecamatan in daerah.items()}
+    berhenti = _path(job_id, "berhenti")
+
+    # Ringkasan berita arsip tidak diambil ulang jika linknya muncul lagi
+    memo_ringkasan = {}
+    for arsip_query in hasil_lama.values():
+        for _, daftar_baris in arsip_query:
+            for baris in daftar_baris:
+                if baris.get("Ringkasan"):
+                    memo_ringkasan.setdefault(baris["Link"], baris["Ringkasan"])
+
+    # Berita sindikasi dikenali per query (ringkasan wakil dipakai ulang) dan
+    # salinan yang digabung atau dibuang diputuskan per kategori saat hasil ditulis.
+    ambang_duplikat = p.get("ambang_duplikat", AMBANG)
+
+    def cari(query):
+        with statistik.untuk(query.daerah, query.keyword):
+            return cari_berita_keyword(backend, query, pencocok[query.daerah], cache, p.get("hemat_ringkasan", False), memo_ringkasan, checkpoint, ambang_duplikat if mode_duplikat else None)
+
+    def label(nama_daerah, kategori):
+        return f"{nama_daerah} - {kategori}" if per_daerah else kategori
+
+    def selesai_query(query):
+        with statistik.untuk(query.daerah, query.keyword) as pencatat:
+            pencatat.tambah("baris_arsip", sum(len(baris) for _, baris in hasil_lama.get(query, ())))
+        statistik.selesai_kata_kunci(query.daerah, query.keyword)
+
+    # Query yang seluruhnya tercakup arsip langsung selesai tanpa pencarian
+    if rencana_baru:
+        for query in daftar_query:
+            if not sub_query[query]:
+                selesai_query(query)
+
+    # Kategori ditulis ke berkas hasil sesuai urutan sheet begitu semua query-nya
+    # selesai; hasil query yang tidak lagi dibutuhkan kategori berikutnya dibuang
+    # dari memori (tetap tersimpan di checkpoint).
+    format_hasil = p.get("format", "xlsx")
+    kolom = KOLOM + [KOLOM_SUMBER_LAIN] if mode_duplikat == "gabung" else KOLOM
+    penulis = buat_penulis(format_hasil, _path(job_id, "hasil"), per_daerah=per_daerah, kolom=kolom)
+    antrean_kategori = list(rencana_kategori.items())
+    jumlah_baris = {}
+
+    def tulis_kategori_siap():
+        while antrean_kategori and all(q in hasil_query for q in antrean_kategori[0][1]):
+            (nama_daerah, kategori), daftar = antrean_kategori.pop(0)
+            baris = gabungkan_kategori(daftar, hasil_query, hasil_lama, mode_duplikat, ambang_duplikat)
+            penulis.tulis_kategori(kategori, baris, daerah=nama_daerah)
+            if baris:
+                jumlah_baris[label(nama_daerah, kategori)] = len(baris)
+            masih_dipakai = {q for _, d in antrean_kategori for q in d}
+            for query in set(daftar) - masih_dipakai:
+                hasil_query[query] = ()
+                hasil_lama.pop(query, None)
+                for sub in sub_query[query]:
+                    hasil_sub[sub] = ()
+                    checkpoint.lepas(sub)
+
+    tulis_kategori_siap()
+    try:
+        with ThreadPoolExecutor(max_workers=backend.jumlah) as executor:
+            berjalan = {}
+            antrean = list(sisa)
+            while antrean or berjalan:
+                if os.path.exists(berhenti):
+                    antrean.clear()
+                while antrean and len(berjalan) < backend.jumlah:
+                    sub = antrean.pop(0)
+                    future = executor.submit(cari, sub)
+                    berjalan[future] = sub
+                if not berjalan:
+                    break
+                selesai, _ = wait(berjalan, timeout=5, return_when=FIRST_COMPLETED)
+                for future in selesai:
+                    sub = berjalan.pop(future)
+                    baris, catatan = future.result()
+                    checkpoint.catat_selesai(sub, baris, catatan)
+                    hasil_sub[sub] = baris
+                    # Hasil yang mungkin tidak lengkap tidak dicatat sebagai rentang tercakup
+                    if arsip is not None and not any(jenis == "warning" for jenis, _ in catatan):
+                        arsip.simpan(sub, jejak[sub.daerah], job_id, baris, hari_ini)
+                    query = induk[sub]
+                    rentang = f" ({sub.tanggal_awal} - {sub.tanggal_akhir})" if sub != query else ""
+                    status.log(f"🔍 {label(sub.daerah, sub.keyword)}{rentang}: {len(baris)} berita")
+                    for _, pesan in catatan:
+                        status.log(pesan.strip())
+                    if kumpulkan(query):
+                        selesai_query(query)
+                tulis_kategori_siap()
+                status.tulis(selesai=len(hasil_sub))
+    except BackendGagal as e:
+        status.tulis(status="gagal", pesan=str(e))
+        return
+    finally:
+        backend.tutup()
+        if cache is not None:
+            cache.close()
+        if arsip is not None:
+            arsip.close()
+
+    if antrean_kategori:
+        penulis.batal()
+        status.tulis(status="dihentikan", pesan="Job dihentikan; dapat dilanjutkan dari checkpoint terakhir.")
+        return
+
+    baris_statistik = []
+    for query in daftar_query:
+        baris_statistik.append(baris_sheet("Kata Kunci", query.daerah, query.keyword, statistik.kata_kunci(query.daerah, query.keyword)))
+    for (nama_daerah, kategori), daftar in rencana_kategori.items():
+        ringkasan = statistik.gabungan((q.daerah, q.keyword) for q in daftar)
+        statistik.tulis_log("kategori", nama_daerah, str(kategori), ringkasan)
+        baris_statistik.append(baris_sheet("Kategori", nama_daerah, str(kategori), ringkasan))
+    if per_daerah:
+        for nama_daerah in daerah:
+            ringkasan = statistik.gabungan((q.daerah, q.keyword) for q in daftar_query if q.daerah == nama_daerah)
+            statistik.tulis_log("daerah", nama_daerah, "", ringkasan)
+            baris_statistik.append(baris_sheet("Daerah", nama_daerah, "", ringkasan))
+    total = statistik.gabungan((q.daerah, q.keyword) for q in daftar_query)
+    statistik.tulis_log("total", "", "", total)
+    baris_statistik.append(baris_sheet("Total", "", "", total))
+    penulis.tulis_statistik(baris_statistik)
+
+    ada_hasil = penulis.tutup()
+    status.tulis(status="selesai", ada_hasil=ada_hasil, format=format_hasil, jumlah_baris=jumlah_baris, statistik=total)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        sys.exit("Penggunaan: python -m skena.job <job_id>")
+    job_id = argv[0]
+    try:
+        jalankan_job(job_id)
+    except Exception as e:
+        status = _baca_json(_path(job_id, "status.json"), {})
+        status.update({"status": "gagal", "pesan": f"{type(e).__name__}: {e}"})
+        _tulis_json(_path(job_id, "status.json"), status)
+        raise
+
+
+if __name__ == "__main__":
+    main()
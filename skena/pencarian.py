@@ -0,0 +1,254 @@
+"""Pencarian berita per kata kunci di Google News beserta filter hasilnya.
+
+Fungsi di sini dijalankan dari thread worker, sehingga tidak boleh memanggil
+Streamlit secara langsung; pesan untuk pengguna dikembalikan sebagai catatan.
+"""
+import os
+from collections import namedtuple
+from urllib.parse import quote
+
+from skena import statistik
+from skena.backend import BackendGagal, HalamanTidakTerbaca
+from skena.cache import kunci_serp, ttl_serp
+from skena.duplikat import AMBANG, IndeksJudul
+from skena.ekspor import KOLOM_SUMBER_LAIN
+from skena.penjadwal import PerluDiulang
+from skena.ringkasan import ambil_ringkasan_batch
+
+
+# Alamat pencarian dapat diarahkan ke server lain, mis. server tiruan di bench/.
+SEARCH_URL = os.environ.get("SKENA_SEARCH_URL", "https://www.google.com/search")
+
+Query = namedtuple("Query", ["keyword", "daerah", "tanggal_awal", "tanggal_akhir"])
+
+
+def rencanakan_query(kata_kunci_lapus_dict, nama_daerah, tanggal_awal, tanggal_akhir):
+    """Menyusun query unik sebelum ada akses jaringan.
+
+    Mengembalikan ``(daftar_query, rencana_kategori)``: ``daftar_query`` berisi
+    tiap Query satu kali sesuai urutan kemunculan pertama, sedangkan
+    ``rencana_kategori`` memetakan kategori ke daftar Query miliknya (urutan
+    asli, boleh berulang) sehingga hasil satu query bisa dibagikan ke semua
+    kategori yang memuat kata kunci yang sama.
+    """
+    daftar_query, rencana_kategori = {}, {}
+    for kategori, kata_kunci_list in kata_kunci_lapus_dict.items():
+        rencana_kategori[kategori] = []
+        for keyword_raw in kata_kunci_list:
+            keyword = str(keyword_raw).strip()
+            if not keyword: continue
+            query = Query(keyword, nama_daerah, tanggal_awal, tanggal_akhir)
+            daftar_query.setdefault(query, None)
+            rencana_kategori[kategori].append(query)
+    return list(daftar_query), rencana_kategori
+
+
+def rencanakan_daerah(kata_kunci_lapus_dict, daftar_daerah, tanggal_awal, tanggal_akhir):
+    """Seperti rencanakan_query untuk beberapa daerah sekaligus.
+
+    ``rencana_kategori`` dikunci dengan ``(daerah, kategori)`` dan diurutkan
+    per daerah, sehingga hasil satu daerah dapat ditulis sebelum daerah
+    berikutnya selesai.
+    """
+    daftar_query, rencana_kategori = [], {}
+    for nama_daerah in daftar_daerah:
+        query_daerah, rencana = rencanakan_query(kata_kunci_lapus_dict, nama_daerah, tanggal_awal, tanggal_akhir)
+        daftar_query.extend(query_daerah)
+        rencana_kategori.update(((nama_daerah, kategori), daftar) for kategori, daftar in rencana.items())
+    return daftar_query, rencana_kategori
+
+
+def buat_url_pencarian(keyword, nama_daerah, tanggal_awal, tanggal_akhir):
+    """Menyusun URL pencarian Google News untuk satu kata kunci dan rentang tanggal."""
+    query = quote(keyword + " " + nama_daerah)
+    return f"{SEARCH_URL}?q={query}&tbm=nws&tbs=cdr:1,cd_min:{tanggal_awal},cd_max:{tanggal_akhir},sbd:1"
+
+
+def cari_berita_keyword(backend, query, pencocok, cache=None, hemat_ringkasan=False, memo_ringkasan=None, checkpoint=None, ambang_duplikat=None):
+    """Mencari satu Query dan mengembalikan (baris yang lolos filter, catatan).
+
+    Setiap baris berupa dict tanpa kolom ``Nomor``; penomoran dan dedup link
+    antar kata kunci dilakukan oleh pemanggil agar hasilnya tetap urut.
+    Catatan berupa daftar tuple ``(jenis, pesan)`` untuk ditampilkan di UI.
+    Dengan ``hemat_ringkasan=True`` berita yang lolos dari judulnya saja
+    disimpan tanpa ringkasan sehingga halamannya tidak perlu diunduh.
+    ``memo_ringkasan`` adalah dict bersama satu run agar link yang muncul di
+    beberapa kata kunci cukup diambil sekali. Jika ``checkpoint`` diberikan,
+    daftar halaman dan baris tiap halaman yang selesai dicatat ke sana dan
+    halaman yang sudah tercatat tidak diproses ulang.
+
+    Jika ``ambang_duplikat`` diberikan, berita sindikasi di dalam query ini
+    dikenali dari judulnya: salinan memakai ringkasan wakilnya (berita
+    pertama dengan judul mirip, menurut urutan halaman) tanpa diunduh lagi.
+    Indeksnya sengaja tidak dibagi antar query agar ringkasan dan keputusan
+    filter tiap baris tidak bergantung pada worker mana yang selesai lebih
+    dulu. Salinan tetap dikembalikan sebagai baris biasa; penggabungan atau
+    pembuangannya diputuskan gabungkan_kategori.
+    """
+    hasil, catatan = [], []
+    try:
+        _cari(backend, query, pencocok, cache, hemat_ringkasan, memo_ringkasan, checkpoint, ambang_duplikat, hasil, catatan)
+    except BackendGagal:
+        raise
+    except PerluDiulang as e:
+        catatan.append(("warning", f"Pencarian '{query.keyword}' dibatasi server ({e}) setelah beberapa percobaan. Hasil kata kunci ini mungkin tidak lengkap."))
+    except HalamanTidakTerbaca as e:
+        catatan.append(("warning", f"Halaman pencarian '{query.keyword}' tidak dapat dibaca ({e}). Hasil kata kunci ini mungkin tidak lengkap."))
+    except Exception as e:
+        catatan.append(("warning", f"Terjadi error saat memproses keyword '{query.keyword}'. Melanjutkan... Error: {type(e).__name__}"))
+    return hasil, catatan
+
+
+def _cari(backend, query, pencocok, cache, hemat_ringkasan, memo_ringkasan, checkpoint, ambang_duplikat, hasil, catatan):
+    """Isi cari_berita_keyword; baris yang sudah lolos tetap tersimpan jika terjadi error di tengah jalan."""
+    keyword, nama_daerah, tanggal_awal, tanggal_akhir = query
+    indeks_judul = IndeksJudul(ambang_duplikat) if ambang_duplikat is not None else None
+    base_url = buat_url_pencarian(keyword, nama_daerah, tanggal_awal, tanggal_akhir)
+    serp_ttl = ttl_serp(tanggal_akhir)
+
+    start_values = checkpoint.daftar_start(query) if checkpoint is not None else None
+    if start_values is None and cache is not None:
+        start_values = cache.get("halaman", kunci_serp(keyword, nama_daerah, tanggal_awal, tanggal_akhir), ttl=serp_ttl)
+
+    # Halaman pertama yang dibuka untuk membaca paginasi langsung dipakai
+    # sebagai halaman start=0, sehingga tidak dimuat dua kali.
+    halaman_pertama = {}
+    if start_values is None:
+        with statistik.ukur("serp_pertama"):
+            start_values, halaman_pertama[0] = backend.ambil_pertama(base_url)
+        if cache is not None:
+            cache.set("halaman", kunci_serp(keyword, nama_daerah, tanggal_awal, tanggal_akhir), start_values)
+            if halaman_pertama[0] is not None:
+                cache.set("serp", kunci_serp(keyword, nama_daerah, tanggal_awal, tanggal_akhir, 0), halaman_pertama[0])
+    if checkpoint is not None:
+        checkpoint.catat_daftar_start(query, start_values)
+
+    link_lolos = set()
+    for start in start_values:
+        tercatat = checkpoint.halaman(query, start) if checkpoint is not None else None
+        if tercatat is not None:
+            for baris in tercatat:
+                hasil.append(baris)
+                link_lolos.add(baris["Link"])
+            # Judul halaman ini didaftarkan ulang dengan urutan yang sama
+            # agar wakil halaman berikutnya sama seperti run tanpa jeda.
+            if indeks_judul is not None:
+                for link, judul in checkpoint.dilihat(query, start):
+                    indeks_judul.wakil(judul, link)
+            continue
+
+        baris_serp = None
+        if start in halaman_pertama:
+            baris_serp = halaman_pertama[start]
+        elif cache is not None:
+            baris_serp = cache.get("serp", kunci_serp(keyword, nama_daerah, tanggal_awal, tanggal_akhir, start), ttl=serp_ttl)
+            if baris_serp is not None:
+                statistik.hitung("cache_hit_serp")
+
+        if baris_serp is None and start not in halaman_pertama:
+            try:
+                with statistik.ukur("serp_halaman"):
+                    baris_serp = backend.ambil_halaman(base_url + f"&start={start}")
+            except PerluDiulang as e:
+                # Halaman lain tetap dicoba; hanya halaman ini yang terlewat
+                catatan.append(("warning", f"Halaman start={start} untuk '{keyword}' dilewati karena server membatasi permintaan ({e})."))
+                continue
+            except HalamanTidakTerbaca as e:
+                catatan.append(("warning", f"Halaman start={start} untuk '{keyword}' dilewati karena tidak dapat dibaca ({e})."))
+                continue
+            if baris_serp is not None and cache is not None:
+                cache.set("serp", kunci_serp(keyword, nama_daerah, tanggal_awal, tanggal_akhir, start), baris_serp)
+        if baris_serp is None:
+            catatan.append(("text", f"     -- Tidak ada hasil di halaman ini untuk '{keyword}'"))
+            continue
+
+        statistik.hitung("halaman")
+        statistik.hitung("link_dilihat", len(baris_serp))
+        kandidat = [tuple(baris) for baris in baris_serp if baris[0] not in link_lolos]
+
+        # Salinan sindikasi memakai ringkasan wakilnya, sehingga satu cerita
+        # cukup diunduh sekali walaupun muncul di banyak portal untuk query ini.
+        wakil = {}
+        if indeks_judul is not None:
+            wakil = {link: indeks_judul.wakil(judul, link) for link, judul, _ in kandidat}
+            statistik.hitung("duplikat_dekat", sum(link != w for link, w in wakil.items()))
+
+        # Judul yang sudah memenuhi filter tidak butuh ringkasan untuk diputuskan;
+        # pada mode hemat ringkasannya tidak diambil sama sekali.
+        perlu_ringkasan = [
+            wakil.get(link, link) for link, judul, _ in kandidat
+            if not (hemat_ringkasan and pencocok.cocok_judul(keyword, judul))
+        ]
+
+        # Ringkasan satu halaman diambil paralel, urutan hasil tetap
+        gagal = []
+        with statistik.ukur("ringkasan_halaman"):
+            ringkasan_dict = dict(zip(perlu_ringkasan, ambil_ringkasan_batch(perlu_ringkasan, cache=cache, memo=memo_ringkasan, gagal=gagal)))
+
+        baris_halaman = []
+        with statistik.ukur("filter"):
+            for link, judul, tanggal in kandidat:
+                if link in link_lolos: continue
+                ringkasan = ringkasan_dict.get(wakil.get(link, link), "")
+
+                # Filter Fleksibel
+                if pencocok.cocok(keyword, judul, ringkasan):
+                    baris_halaman.append({"Kata Kunci": keyword, "Judul": judul, "Link": link, "Tanggal": tanggal, "Ringkasan": ringkasan})
+                    link_lolos.add(link)
+        statistik.hitung("link_lolos", len(baris_halaman))
+        hasil.extend(baris_halaman)
+        if gagal:
+            # Halaman ini tidak dicatat ke checkpoint agar diproses ulang saat job dilanjutkan
+            catatan.append(("warning", f"Ringkasan {len(gagal)} berita di halaman start={start} untuk '{keyword}' gagal diambil; berita itu difilter dari judulnya saja."))
+            continue
+        if checkpoint is not None:
+            checkpoint.catat_halaman(query, start, baris_halaman, [(link, judul) for link, judul, _ in kandidat] if indeks_judul is not None else ())
+
+
+def gabungkan_kategori(daftar_query, hasil_query, hasil_lama=None, mode_duplikat=None, ambang_duplikat=AMBANG):
+    """Menyusun baris satu kategori dari hasil tiap Query miliknya.
+
+    Urutan mengikuti kata kunci di sheet; link yang sudah ada di kategori yang
+    sama dilewati dan ``Nomor`` diberikan berurutan mulai dari 1.
+
+    Berita sindikasi diputuskan di sini, per kategori dan daerah, dengan urutan
+    yang sama seperti di atas sehingga hasilnya tidak bergantung pada worker
+    mana yang selesai lebih dulu: baris pertama dari satu cerita menjadi
+    wakil, salinannya digabung ke kolom ``Sumber Lain`` wakil itu
+    (``mode_duplikat="gabung"``) atau dibuang (``"lewati"``).
+
+    ``hasil_lama`` ({Query: [(generasi, baris), ...]}) berisi baris arsip dari
+    run sebelumnya. Baris ini didahulukan per generasi dengan urutan yang sama
+    seperti saat pertama ditulis, sehingga berita lama tetap bernomor sama dan
+    berita baru menyusul di belakang.
+    """
+    hasil_lama = hasil_lama or {}
+    urutan = []
+    for generasi in sorted({g for query in daftar_query for g, _ in hasil_lama.get(query, ())}):
+        for query in daftar_query:
+            urutan.extend(baris for g, baris in hasil_lama.get(query, ()) if g == generasi)
+    urutan.extend(hasil_query.get(query, ()) for query in daftar_query)
+
+    indeks = IndeksJudul(ambang_duplikat) if mode_duplikat else None
+    baris_wakil = {}
+    hasil_kategori, set_link = [], set()
+    nomor = 1
+    for daftar_baris in urutan:
+        for baris in daftar_baris:
+            if baris["Link"] in set_link: continue
+            set_link.add(baris["Link"])
+            if indeks is not None:
+                wakil = indeks.wakil(baris["Judul"], baris["Link"])
+                if wakil in baris_wakil:
+                    if mode_duplikat == "gabung":
+                        tujuan = baris_wakil[wakil]
+                        tujuan[KOLOM_SUMBER_LAIN] = "\n".join(filter(None, [tujuan[KOLOM_SUMBER_LAIN], baris["Link"]]))
+                    continue
+            baris = {"Nomor": nomor, **baris}
+            if mode_duplikat == "gabung":
+                baris[KOLOM_SUMBER_LAIN] = ""
+            hasil_kategori.append(baris)
+            if indeks is not None:
+                baris_wakil[wakil] = baris
+            nomor += 1
+    return hasil_kategori
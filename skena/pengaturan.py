@@ -0,0 +1,9 @@
+"""Pengaturan dari environment yang juga dibaca halaman Streamlit.
+
+Sengaja tanpa import berat agar ``app.py`` tidak ikut memuat requests,
+BeautifulSoup atau Selenium hanya untuk menampilkan nilai bawaan.
+"""
+import os
+
+BACKEND = os.environ.get("SKENA_BACKEND", "selenium")
+JUMLAH_WORKER = int(os.environ.get("SKENA_JUMLAH_WORKER", 2))
@@ -0,0 +1,144 @@
+"""Pengatur laju dan percobaan ulang permintaan, dipisah per host.
+
+Setiap host memiliki token bucket sendiri. Lajunya naik perlahan selama
+permintaan berhasil dan turun setengahnya begitu host membalas 429, 5xx atau
+halaman blokir (AIMD). Permintaan yang ditolak sementara diulang dengan jeda
+eksponensial plus jitter; ``Retry-After`` dari server dihormati (paling lama
+``JEDA_MAKS`` detik) dan menahan semua permintaan ke host tersebut.
+"""
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from skena import statistik
+
+MAKS_PERCOBAAN = int(os.environ.get("SKENA_MAKS_PERCOBAAN", 4))
+JEDA_AWAL = float(os.environ.get("SKENA_JEDA_AWAL", 1.0))
+JEDA_MAKS = 60.0
+
+
+class PerluDiulang(Exception):
+    """Permintaan ditolak sementara oleh server (429, 5xx, halaman blokir) dan boleh dicoba lagi."""
+
+    def __init__(self, pesan, retry_after=None):
+        super().__init__(pesan)
+        self.retry_after = retry_after
+
+
+def baca_retry_after(nilai):
+    """Detik dari header ``Retry-After`` (angka atau tanggal HTTP), atau None."""
+    if not nilai:
+        return None
+    try:
+        return max(0.0, float(nilai))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(nilai).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def periksa_respons(response):
+    """Melempar PerluDiulang untuk respons 429 dan 5xx."""
+    if response.status_code == 429 or 500 <= response.status_code < 600:
+        raise PerluDiulang(f"HTTP {response.status_code}", baca_retry_after(response.headers.get("Retry-After")))
+
+
+class TokenBucket:
+    """Token bucket dengan laju adaptif; ``laju <= 0`` berarti tanpa batas laju."""
+
+    def __init__(self, laju, kapasitas=1, laju_maks=None, laju_min=0.2, langkah=0.1):
+        self.laju = laju
+        self.laju_maks = laju_maks or laju
+        self.laju_min = min(laju_min, laju) if laju > 0 else 0
+        self.kapasitas = max(1, kapasitas)
+        self.langkah = langkah
+        self._token = float(self.kapasitas)
+        self._waktu = time.monotonic()
+        self._tahan_sampai = 0.0
+        self._lock = threading.Lock()
+
+    def _isi(self, sekarang):
+        if self.laju > 0:
+            self._token = min(self.kapasitas, self._token + (sekarang - self._waktu) * self.laju)
+        self._waktu = sekarang
+
+    def ambil(self):
+        """Menunggu sampai ada token untuk satu permintaan."""
+        while True:
+            with self._lock:
+                sekarang = time.monotonic()
+                self._isi(sekarang)
+                if sekarang < self._tahan_sampai:
+                    tunggu = self._tahan_sampai - sekarang
+                elif self.laju <= 0:
+                    return
+                elif self._token >= 1:
+                    self._token -= 1
+                    return
+                else:
+                    tunggu = (1 - self._token) / self.laju
+            time.sleep(tunggu)
+
+    def berhasil(self):
+        with self._lock:
+            if self.laju > 0:
+                self.laju = min(self.laju_maks, self.laju + self.langkah)
+
+    def ditolak(self, retry_after=None):
+        with self._lock:
+            if self.laju > 0:
+                self.laju = max(self.laju_min, self.laju / 2)
+                self._token = min(self._token, 0.0)
+            if retry_after:
+                self._tahan_sampai = max(self._tahan_sampai, time.monotonic() + min(retry_after, JEDA_MAKS))
+
+
+class Penjadwal:
+    """Menjalankan permintaan per host dengan token bucket dan percobaan ulang."""
+
+    def __init__(self, laju, kapasitas=1, laju_maks=None, maks_percobaan=MAKS_PERCOBAAN, jeda_awal=JEDA_AWAL):
+        self.laju = laju
+        self.kapasitas = kapasitas
+        self.laju_maks = laju_maks
+        self.maks_percobaan = max(1, maks_percobaan)
+        self.jeda_awal = jeda_awal
+        self._bucket = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlsplit(url or "").netloc.lower()
+        with self._lock:
+            if host not in self._bucket:
+                self._bucket[host] = TokenBucket(self.laju, self.kapasitas, self.laju_maks)
+            return self._bucket[host]
+
+    def jeda(self, percobaan, retry_after=None):
+        """Jeda sebelum percobaan berikutnya: eksponensial dengan separuhnya acak, paling lama ``JEDA_MAKS``."""
+        dasar = min(JEDA_MAKS, self.jeda_awal * 2 ** (percobaan - 1))
+        return max(dasar / 2 + random.uniform(0, dasar / 2), min(retry_after or 0, JEDA_MAKS))
+
+    def jalankan(self, url, fungsi, dapat_diulang=(PerluDiulang,)):
+        """Memanggil ``fungsi()`` sesuai laju host ``url`` dan mengulanginya jika gagal sementara.
+
+        Error dari ``dapat_diulang`` pada percobaan terakhir dilempar ulang ke pemanggil.
+        """
+        bucket = self.bucket(url)
+        for percobaan in range(1, self.maks_percobaan + 1):
+            bucket.ambil()
+            try:
+                hasil = fungsi()
+            except dapat_diulang as e:
+                retry_after = getattr(e, "retry_after", None)
+                bucket.ditolak(retry_after)
+                if percobaan == self.maks_percobaan:
+                    raise
+                statistik.hitung("diulang")
+                time.sleep(self.jeda(percobaan, retry_after))
+            else:
+                bucket.berhasil()
+                return hasil
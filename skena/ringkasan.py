@@ -0,0 +1,280 @@
+"""Pengambilan ringkasan artikel berita.
+
+Modul ini sengaja dipisah dari ``app.py``: Streamlit mengeksekusi ulang
+``app.py`` pada setiap klik, sedangkan modul yang di-import hanya dimuat
+sekali sehingga ``requests.Session`` (dan pool koneksinya) tetap hidup antar
+rerun.
+"""
+import codecs
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from skena import statistik
+from skena.cache import normalisasi_url
+from skena.penjadwal import Penjadwal, periksa_respons
+
+USER_AGENT = 'Mozilla/5.0'
+TIMEOUT = 10
+
+# Mode streaming: baca halaman bertahap dan berhenti begitu ringkasan ketemu.
+STREAMING = os.environ.get("SKENA_RINGKASAN_STREAMING", "1") != "0"
+MAKS_BYTES_RINGKASAN = int(os.environ.get("SKENA_RINGKASAN_MAKS_KB", 1024)) * 1024
+UKURAN_POTONGAN = 16 * 1024
+
+# Batas paralel global dan per host untuk ambil_ringkasan_batch.
+MAKS_PARALEL = 16
+MAKS_PER_HOST = 4
+
+# Laju awal per portal (permintaan/detik); dinaikkan sampai dua kali lipat
+# selama portal sehat dan diturunkan saat portal membalas 429/5xx.
+LAJU_ARTIKEL = float(os.environ.get("SKENA_LAJU_ARTIKEL", 20.0))
+MAKS_PERCOBAAN_RINGKASAN = 2
+
+_session = None
+_session_lock = threading.Lock()
+
+# Batas dibagi oleh semua pemanggil (mis. beberapa worker browser sekaligus),
+# sehingga jumlah koneksi ke satu portal tidak berlipat ganda.
+_batas_global = threading.BoundedSemaphore(MAKS_PARALEL)
+_batas_host = {}
+_batas_host_lock = threading.Lock()
+_penjadwal = Penjadwal(LAJU_ARTIKEL, kapasitas=MAKS_PER_HOST, laju_maks=2 * LAJU_ARTIKEL, maks_percobaan=MAKS_PERCOBAAN_RINGKASAN)
+
+
+def get_session():
+    """Mengembalikan requests.Session bersama dengan pool koneksi."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update({'User-Agent': USER_AGENT})
+            adapter = HTTPAdapter(pool_connections=MAKS_PARALEL, pool_maxsize=MAKS_PER_HOST)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+class _PembacaRingkasan(HTMLParser):
+    """Parser bertahap yang mencari ringkasan dengan urutan prioritas ambil_ringkasan.
+
+    Urutannya: ``<meta name="description">``, ``<meta property="og:description">``,
+    lalu teks ``<p>`` pertama. Parser dianggap selesai begitu hasil akhirnya
+    tidak mungkin berubah lagi oleh sisa dokumen.
+
+    Teks paragraf disusun seperti ``get_text(strip=True)``: tiap node teks
+    (yang bisa datang dalam beberapa ``handle_data`` jika terpotong batas
+    potongan) digabung dulu, baru di-strip saat tag atau komentar berikutnya.
+
+    Bedanya dengan versi BeautifulSoup: ``og:description`` di ``<head>``
+    langsung dipakai, walaupun ``<meta name="description">`` (yang tidak
+    valid di luar head) baru muncul di ``<body>``.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.deskripsi = None
+        self.og_desc = None
+        self.paragraf = None
+        self.head_selesai = False
+        self.paragraf_selesai = False
+        self._di_paragraf = False
+        self._di_script = 0
+        self._node = []
+
+    def _tutup_node(self):
+        if self._node:
+            teks = "".join(self._node).strip()
+            self._node = []
+            if teks:
+                self.paragraf.append(teks)
+
+    def handle_starttag(self, tag, attrs):
+        self._tutup_node()
+        if tag == "meta":
+            attrs = dict(attrs)
+            if attrs.get("name") == "description" and self.deskripsi is None:
+                self.deskripsi = attrs.get("content") or ""
+            if attrs.get("property") == "og:description" and self.og_desc is None:
+                self.og_desc = attrs.get("content") or ""
+        elif tag == "body":
+            self.head_selesai = True
+        elif tag == "p":
+            if self._di_paragraf:
+                self._tutup_paragraf()
+            elif self.paragraf is None:
+                self.paragraf = []
+                self._di_paragraf = True
+        elif tag in ("script", "style"):
+            self._di_script += 1
+
+    def handle_endtag(self, tag):
+        self._tutup_node()
+        if tag == "head":
+            self.head_selesai = True
+        elif tag == "p" and self._di_paragraf:
+            self._tutup_paragraf()
+        elif tag in ("script", "style") and self._di_script:
+            self._di_script -= 1
+
+    def handle_data(self, data):
+        if self._di_paragraf and not self._di_script:
+            self._node.append(data)
+
+    def handle_comment(self, data):
+        self._tutup_node()
+
+    def _tutup_paragraf(self):
+        self._di_paragraf = False
+        self.paragraf_selesai = True
+
+    @property
+    def selesai(self):
+        if self.deskripsi:
+            return True
+        if not self.head_selesai:
+            return False
+        return bool(self.og_desc) or self.paragraf_selesai
+
+    def hasil(self):
+        if self.deskripsi:
+            return self.deskripsi
+        if self.og_desc:
+            return self.og_desc
+        if self.paragraf is not None:
+            self._tutup_node()
+            return "".join(self.paragraf)
+        return ""
+
+
+def _adalah_html(content_type):
+    """True jika Content-Type kosong atau menunjukkan dokumen HTML."""
+    jenis = (content_type or "").split(";")[0].strip().lower()
+    return not jenis or jenis in ("text/html", "application/xhtml+xml")
+
+
+def ambil_ringkasan(link, session=None, streaming=STREAMING):
+    """Mengambil ringkasan/deskripsi dari sebuah link berita.
+
+    Pada mode streaming, respons dibaca bertahap paling banyak
+    ``MAKS_BYTES_RINGKASAN`` byte dan koneksi ditutup begitu ringkasan
+    ditemukan; respons yang bukan HTML dilewati tanpa diunduh. Permintaan
+    mengikuti laju per portal dan diulang sekali jika portal membalas 429/5xx.
+    Jumlah permintaan serentak dibatasi ``MAKS_PARALEL`` secara global dan
+    ``MAKS_PER_HOST`` untuk tiap host. Mengembalikan None jika halaman gagal
+    diambil, agar bisa dibedakan dari halaman tanpa ringkasan.
+    """
+    ambil = _ambil_ringkasan_stream if streaming else _ambil_ringkasan_penuh
+
+    def _sekali():
+        with _batas_untuk(link), _batas_global, statistik.ukur("ringkasan"):
+            return ambil(link, session)
+
+    try:
+        return _penjadwal.jalankan(link, _sekali)
+    except requests.Timeout:
+        statistik.hitung("timeout")
+        return None
+    except Exception:
+        return None
+
+
+def _ambil_ringkasan_stream(link, session=None):
+    http = session if session is not None else requests
+    with http.get(link, timeout=TIMEOUT, headers={'User-Agent': USER_AGENT}, stream=True) as response:
+        periksa_respons(response)
+        if not _adalah_html(response.headers.get('Content-Type')):
+            return ""
+        # Sama seperti response.text: pakai encoding dari header
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        pembaca = _PembacaRingkasan()
+        dibaca = 0
+        for potongan in response.iter_content(chunk_size=UKURAN_POTONGAN):
+            dibaca += len(potongan)
+            pembaca.feed(decoder.decode(potongan))
+            if pembaca.selesai or dibaca >= MAKS_BYTES_RINGKASAN:
+                break
+        else:
+            pembaca.feed(decoder.decode(b'', final=True))
+            pembaca.close()
+        return pembaca.hasil()
+
+
+def _ambil_ringkasan_penuh(link, session=None):
+    """Versi lama ambil_ringkasan: unduh seluruh halaman lalu parse dengan BeautifulSoup."""
+    http = session if session is not None else requests
+    response = http.get(link, timeout=TIMEOUT, headers={'User-Agent': USER_AGENT})
+    periksa_respons(response)
+    soup = BeautifulSoup(response.text, 'html.parser')
+
+    deskripsi = soup.find('meta', attrs={'name': 'description'})
+    if deskripsi and deskripsi.get('content'): return deskripsi['content']
+
+    og_desc = soup.find('meta', attrs={'property': 'og:description'})
+    if og_desc and og_desc.get('content'): return og_desc['content']
+
+    p_tag = soup.find('p')
+    if p_tag: return p_tag.get_text(strip=True)
+    return ""
+
+
+def _batas_untuk(link):
+    """Semaphore per host untuk sebuah link."""
+    host = urlsplit(link or "").netloc.lower()
+    with _batas_host_lock:
+        return _batas_host.setdefault(host, threading.BoundedSemaphore(MAKS_PER_HOST))
+
+
+def ambil_ringkasan_batch(links, maks_paralel=MAKS_PARALEL, cache=None, memo=None, gagal=None):
+    """Mengambil ringkasan banyak link secara paralel; hasil mengikuti urutan input.
+
+    Link yang sama hanya diambil sekali. Batas ``MAKS_PARALEL`` dan
+    ``MAKS_PER_HOST`` dari ambil_ringkasan berlaku bersama, termasuk ketika
+    fungsi ini dipanggil dari beberapa thread sekaligus.
+    Jika ``cache`` diberikan, ringkasan dibaca dari dan disimpan ke cache.
+    ``memo`` (dict) menyimpan hasil di memori selama satu run, termasuk
+    ringkasan kosong yang tidak disimpan ke cache. Link yang gagal diambil
+    mendapat ringkasan kosong, tidak dimasukkan ke ``memo`` (agar dicoba lagi
+    oleh pemanggil berikutnya) dan ditambahkan ke list ``gagal`` jika diberikan.
+    """
+    links = list(links)
+    hasil = {}
+    for link in dict.fromkeys(links):
+        tersimpan = memo.get(link) if memo is not None else None
+        if tersimpan is None and cache is not None and link:
+            tersimpan = cache.get("ringkasan", normalisasi_url(link))
+        if tersimpan is not None:
+            hasil[link] = tersimpan
+    perlu_diambil = [link for link in dict.fromkeys(links) if link not in hasil]
+    statistik.hitung("cache_hit_ringkasan", len(hasil))
+    statistik.hitung("ringkasan_diambil", len(perlu_diambil))
+
+    if perlu_diambil:
+        session = get_session()
+        # Pencatat statistik dibawa ke thread pool agar durasi tercatat per kata kunci
+        pencatat = statistik.aktif()
+
+        def _ambil(link):
+            with statistik.memakai(pencatat):
+                return ambil_ringkasan(link, session=session)
+
+        with ThreadPoolExecutor(max_workers=min(maks_paralel, len(perlu_diambil))) as pool:
+            for link, ringkasan in zip(perlu_diambil, pool.map(_ambil, perlu_diambil)):
+                if ringkasan is None:
+                    hasil[link] = ""
+                    if gagal is not None:
+                        gagal.append(link)
+                    continue
+                hasil[link] = ringkasan
+                if memo is not None:
+                    memo[link] = ringkasan
+                if cache is not None and link and ringkasan:
+                    cache.set("ringkasan", normalisasi_url(link), ringkasan)
+    return [hasil[link] for link in links]
@@ -0,0 +1,118 @@
+"""Snapshot lokal workbook kata kunci dari Google Sheets.
+
+Halaman Neraca membaca snapshot JSON di ``SKENA_SNAPSHOT_DIR`` sehingga
+langsung tampil tanpa menunggu Google Drive. Snapshot yang lebih tua dari
+``SNAPSHOT_TTL`` diperbarui di thread latar; perubahannya terlihat pada rerun
+berikutnya. Workbook hanya diunduh secara sinkron jika snapshot belum ada
+atau pengguna meminta muat ulang, dan beberapa workbook diunduh bersamaan.
+Workbook yang isinya tidak berubah (hash sama) tidak diparse ulang.
+
+pandas dan requests baru di-import ketika workbook benar-benar diunduh.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SNAPSHOT_DIR = os.environ.get("SKENA_SNAPSHOT_DIR", ".skena_snapshot")
+SNAPSHOT_TTL = int(os.environ.get("SKENA_SNAPSHOT_TTL", 60 * 60))
+TIMEOUT = 30
+
+_sedang_diperbarui = set()
+_lock = threading.Lock()
+
+
+def _path(url, sheet_name):
+    nama = hashlib.sha256(json.dumps([url, sheet_name]).encode("utf-8")).hexdigest()[:24]
+    return os.path.join(SNAPSHOT_DIR, f"{nama}.json")
+
+
+def baca_snapshot(url, sheet_name=0):
+    """Snapshot tersimpan ``{"kolom": {nama: [nilai, ...]}, "diambil": ..., ...}``, atau None."""
+    try:
+        with open(_path(url, sheet_name), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _ke_kolom(isi, sheet_name):
+    """Isi workbook -> {nama kolom: daftar nilai teks}, sama seperti yang dipakai start_scraping."""
+    import io
+
+    import pandas as pd
+
+    df = pd.read_excel(io.BytesIO(isi), sheet_name=sheet_name)
+    return {str(c): df[c].dropna().astype(str).str.strip().tolist() for c in df.columns}
+
+
+def unduh(url, sheet_name=0):
+    """Mengunduh workbook dan memperbarui snapshot-nya; mengembalikan snapshot baru."""
+    import requests
+
+    response = requests.get(url, timeout=TIMEOUT)
+    response.raise_for_status()
+    sha = hashlib.sha256(response.content).hexdigest()
+
+    lama = baca_snapshot(url, sheet_name)
+    if lama is not None and lama.get("sha256") == sha:
+        snapshot = {**lama, "diambil": time.time()}
+    else:
+        snapshot = {"url": url, "sheet": sheet_name, "sha256": sha, "diambil": time.time(), "kolom": _ke_kolom(response.content, sheet_name)}
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = _path(url, sheet_name)
+    sementara = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(sementara, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(sementara, path)
+    return snapshot
+
+
+def _perbarui_di_latar(url, sheet_name):
+    kunci = (url, sheet_name)
+    with _lock:
+        if kunci in _sedang_diperbarui:
+            return
+        _sedang_diperbarui.add(kunci)
+
+    def _jalan():
+        try:
+            unduh(url, sheet_name)
+        except Exception:
+            # Snapshot lama tetap dipakai; dicoba lagi pada pemanggilan berikutnya
+            pass
+        finally:
+            with _lock:
+                _sedang_diperbarui.discard(kunci)
+
+    threading.Thread(target=_jalan, daemon=True).start()
+
+
+def muat_sheet(daftar_sumber, paksa=False):
+    """Memuat beberapa sheet ``[(url, sheet_name), ...]`` sekaligus.
+
+    Mengembalikan daftar ``(snapshot, error)`` sesuai urutan input; ``snapshot``
+    None jika sheet belum pernah berhasil diunduh. Dengan ``paksa=True`` semua
+    sheet diunduh ulang sebelum fungsi kembali.
+    """
+    hasil = [(None if paksa else baca_snapshot(url, sheet_name), None) for url, sheet_name in daftar_sumber]
+    perlu_diunduh = [i for i, (snapshot, _) in enumerate(hasil) if snapshot is None]
+
+    if perlu_diunduh:
+        def _unduh(i):
+            try:
+                return unduh(*daftar_sumber[i]), None
+            except Exception as e:
+                return baca_snapshot(*daftar_sumber[i]), e
+
+        with ThreadPoolExecutor(max_workers=len(perlu_diunduh)) as pool:
+            for i, unduhan in zip(perlu_diunduh, pool.map(_unduh, perlu_diunduh)):
+                hasil[i] = unduhan
+
+    for (url, sheet_name), (snapshot, _) in zip(daftar_sumber, hasil):
+        if snapshot is not None and time.time() - snapshot.get("diambil", 0) > SNAPSHOT_TTL:
+            _perbarui_di_latar(url, sheet_name)
+    return hasil
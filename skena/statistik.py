@@ -0,0 +1,169 @@
+"""Pengukuran durasi per tahap dan penghitung selama scraping.
+
+Kode pipeline cukup memanggil ``ukur(tahap)`` dan ``hitung(nama)``; keduanya
+tidak melakukan apa-apa kecuali ada pencatat aktif. Pencatat diaktifkan per
+kata kunci dan daerah dengan ``Statistik.untuk(daerah, keyword)`` sehingga semua pengukuran di
+thread tersebut (dan thread ringkasan yang membawa pencatatnya lewat
+``memakai``) terkumpul per kata kunci.
+"""
+import json
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Urutan kolom penghitung di sheet Statistik
+PENGHITUNG = ["halaman", "link_dilihat", "link_lolos", "ringkasan_diambil", "cache_hit_serp", "cache_hit_ringkasan", "timeout", "diulang", "duplikat_dekat", "baris_arsip"]
+
+_aktif = ContextVar("skena_pencatat", default=None)
+
+
+class _Pencatat:
+    """Durasi dan penghitung untuk satu kata kunci."""
+
+    def __init__(self):
+        self.durasi = defaultdict(list)
+        self.hitungan = Counter()
+        self._lock = threading.Lock()
+
+    def catat(self, tahap, detik):
+        with self._lock:
+            self.durasi[tahap].append(detik)
+
+    def tambah(self, nama, n):
+        with self._lock:
+            self.hitungan[nama] += n
+
+
+def aktif():
+    """Pencatat yang sedang aktif di konteks ini (atau None)."""
+    return _aktif.get()
+
+
+@contextmanager
+def memakai(pencatat):
+    """Mengaktifkan pencatat di thread lain, mis. thread pengambil ringkasan."""
+    token = _aktif.set(pencatat)
+    try:
+        yield pencatat
+    finally:
+        _aktif.reset(token)
+
+
+@contextmanager
+def ukur(tahap):
+    """Mengukur durasi blok sebagai tahap ``tahap`` pada pencatat aktif."""
+    pencatat = _aktif.get()
+    if pencatat is None:
+        yield
+        return
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        pencatat.catat(tahap, time.perf_counter() - mulai)
+
+
+def hitung(nama, n=1):
+    """Menambah penghitung ``nama`` pada pencatat aktif."""
+    pencatat = _aktif.get()
+    if pencatat is not None and n:
+        pencatat.tambah(nama, n)
+
+
+def _persentil(data, p):
+    if len(data) < 2:
+        return data[0] if data else 0.0
+    return statistics.quantiles(data, n=100, method="inclusive")[p - 1]
+
+
+def ringkas(durasi, hitungan):
+    """Ringkasan {penghitung..., tahap: {n, total_detik, p50_ms, p95_ms}} dari data mentah."""
+    hasil = {nama: hitungan.get(nama, 0) for nama in PENGHITUNG}
+    hasil["tahap"] = {
+        tahap: {
+            "n": len(data),
+            "total_detik": round(sum(data), 3),
+            "p50_ms": round(_persentil(data, 50) * 1000, 1),
+            "p95_ms": round(_persentil(data, 95) * 1000, 1),
+        }
+        for tahap, data in sorted(durasi.items())
+    }
+    return hasil
+
+
+class Statistik:
+    """Kumpulan pencatat per kata kunci untuk satu job, dengan log JSON-lines."""
+
+    def __init__(self, path_log=None):
+        self.path_log = path_log
+        self._pencatat = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def untuk(self, daerah, keyword):
+        """Mengaktifkan pencatat milik ``(daerah, keyword)`` selama blok berjalan."""
+        with self._lock:
+            pencatat = self._pencatat.setdefault((daerah, keyword), _Pencatat())
+        with memakai(pencatat):
+            yield pencatat
+
+    def tulis_log(self, jenis, daerah, nama, data):
+        if self.path_log:
+            entri = {"waktu": time.strftime("%Y-%m-%dT%H:%M:%S"), "jenis": jenis, "daerah": daerah, "nama": nama, **data}
+            with self._lock, open(self.path_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entri, ensure_ascii=False) + "\n")
+
+    def kata_kunci(self, daerah, keyword):
+        """Ringkasan statistik satu kata kunci di satu daerah."""
+        pencatat = self._pencatat.get((daerah, keyword)) or _Pencatat()
+        return ringkas(pencatat.durasi, pencatat.hitungan)
+
+    def gabungan(self, daftar_kunci):
+        """Ringkasan gabungan beberapa ``(daerah, keyword)`` (mis. satu kategori atau seluruh job)."""
+        durasi, hitungan = defaultdict(list), Counter()
+        for kunci in dict.fromkeys(daftar_kunci):
+            pencatat = self._pencatat.get(kunci)
+            if pencatat is None:
+                continue
+            for tahap, data in pencatat.durasi.items():
+                durasi[tahap].extend(data)
+            hitungan.update(pencatat.hitungan)
+        return ringkas(durasi, hitungan)
+
+    def muat_log(self):
+        """Memuat ulang data mentah kata kunci dari log run sebelumnya (untuk job yang dilanjutkan)."""
+        if not self.path_log:
+            return
+        try:
+            with open(self.path_log, encoding="utf-8") as f:
+                baris_log = [json.loads(baris) for baris in f if baris.strip()]
+        except (OSError, ValueError):
+            return
+        for entri in baris_log:
+            if entri.get("jenis") != "kata_kunci" or "mentah" not in entri:
+                continue
+            pencatat = self._pencatat.setdefault((entri["daerah"], entri["nama"]), _Pencatat())
+            for tahap, data in entri["mentah"].items():
+                pencatat.durasi[tahap].extend(data)
+            pencatat.hitungan.update({nama: entri.get(nama, 0) for nama in PENGHITUNG})
+
+    def selesai_kata_kunci(self, daerah, keyword):
+        """Menulis baris log untuk kata kunci yang baru selesai (termasuk durasi mentahnya)."""
+        pencatat = self._pencatat.get((daerah, keyword)) or _Pencatat()
+        mentah = {tahap: [round(d, 4) for d in data] for tahap, data in pencatat.durasi.items()}
+        self.tulis_log("kata_kunci", daerah, keyword, {**self.kata_kunci(daerah, keyword), "mentah": mentah})
+
+
+def baris_sheet(tingkat, daerah, nama, ringkasan):
+    """Satu baris sheet Statistik dari hasil ``ringkas``."""
+    baris = {"Tingkat": tingkat, "Daerah": daerah, "Nama": nama}
+    baris.update({nama_hitung: ringkasan.get(nama_hitung, 0) for nama_hitung in PENGHITUNG})
+    for tahap, t in ringkasan.get("tahap", {}).items():
+        baris[f"{tahap} n"] = t["n"]
+        baris[f"{tahap} total (detik)"] = t["total_detik"]
+        baris[f"{tahap} p50 (ms)"] = t["p50_ms"]
+        baris[f"{tahap} p95 (ms)"] = t["p95_ms"]
+    return baris
@@ -0,0 +1,59 @@
+"""Rentang yang belum tercakup arsip dan penggantian segmen lama."""
+from datetime import date
+
+from skena.arsip import Arsip, jejak_filter, sisa_rentang
+from skena.pencarian import Query
+
+JEJAK = "uji"
+
+
+def test_sisa_rentang():
+    d = date
+    assert sisa_rentang(d(2024, 1, 1), d(2024, 3, 31), []) == [(d(2024, 1, 1), d(2024, 3, 31))]
+    assert sisa_rentang(d(2024, 1, 1), d(2024, 3, 31), [(d(2024, 1, 1), d(2024, 2, 9))]) == [(d(2024, 2, 10), d(2024, 3, 31))]
+    assert sisa_rentang(d(2024, 1, 1), d(2024, 3, 31), [(d(2024, 1, 10), d(2024, 2, 9)), (d(2024, 2, 1), d(2024, 2, 20)), (d(2024, 3, 1), d(2024, 3, 31))]) == [
+        (d(2024, 1, 1), d(2024, 1, 9)), (d(2024, 2, 21), d(2024, 2, 29)),
+    ]
+    assert sisa_rentang(d(2024, 1, 1), d(2024, 3, 31), [(d(2024, 1, 1), d(2024, 3, 31))]) == []
+
+
+def test_hanya_rentang_baru_yang_dicari(tmp_path):
+    arsip = Arsip(str(tmp_path))
+    query = Query("padi", "Konawe Selatan", "1/1/2024", "3/31/2024")
+    assert arsip.rencanakan(query, JEJAK) == ([query], [])
+
+    # Job pada 10 Februari: tercakup sampai 9 Februari
+    arsip.simpan(query, JEJAK, "g1", [{"Link": "a"}], hari_ini=date(2024, 2, 10))
+    sub, segmen = arsip.rencanakan(query, JEJAK)
+    assert sub == [query._replace(tanggal_awal="02/10/2024")]
+    assert arsip.baris(segmen) == [("g1", [{"Link": "a"}])]
+
+    arsip.simpan(sub[0], JEJAK, "g2", [{"Link": "b"}], hari_ini=date(2024, 2, 17))
+    sub, segmen = arsip.rencanakan(query, JEJAK)
+    assert sub == [query._replace(tanggal_awal="02/17/2024")]
+    assert arsip.baris(segmen) == [("g1", [{"Link": "a"}]), ("g2", [{"Link": "b"}])]
+
+    # Rentang lain atau pengaturan filter lain tidak memakai segmen ini
+    assert arsip.rencanakan(query._replace(tanggal_awal="1/5/2024", tanggal_akhir="2/12/2024"), JEJAK)[1] == []
+    assert arsip.rencanakan(query, "lain") == ([query], [])
+    arsip.close()
+
+
+def test_segmen_lama_yang_tercakup_diganti(tmp_path):
+    arsip = Arsip(str(tmp_path))
+    query = Query("padi", "Konawe Selatan", "1/1/2024", "3/31/2024")
+    arsip.simpan(query, JEJAK, "g1", [{"Link": "a"}], hari_ini=date(2024, 2, 10))
+    arsip.simpan(query._replace(tanggal_awal="2/10/2024"), JEJAK, "g2", [{"Link": "b"}], hari_ini=date(2024, 2, 17))
+    arsip.simpan(query, JEJAK, "g3", [{"Link": "a"}, {"Link": "b"}, {"Link": "c"}], hari_ini=date(2024, 4, 1))
+
+    sub, segmen = arsip.rencanakan(query, JEJAK)
+    assert sub == []
+    assert arsip.baris(segmen) == [("g3", [{"Link": "a"}, {"Link": "b"}, {"Link": "c"}])]
+    assert arsip._conn.execute("SELECT COUNT(*) FROM baris").fetchone()[0] == 3
+    arsip.close()
+
+
+def test_jejak_membedakan_mode_pencocok():
+    kecamatan = ["Andoolo", "Tinanggea"]
+    assert jejak_filter(kecamatan[::-1]) == jejak_filter(kecamatan)
+    assert jejak_filter(kecamatan, batas_kata=True) != jejak_filter(kecamatan, batas_kata=False)
@@ -0,0 +1,158 @@
+"""Kedua backend pencarian harus membaca baris dan paginasi yang sama dari HTML tersimpan."""
+import os
+from urllib.parse import urljoin
+
+import pytest
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from skena.backend import HalamanTidakTerbaca, adalah_halaman_hasil, parse_halaman_html, parse_start_html
+from skena.browser import SeleniumBackend
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+URL = "https://www.google.com/search?q=harga+padi+Konawe+Selatan&tbm=nws&tbs=cdr:1,cd_min:1/1/2024,cd_max:3/31/2024"
+
+BARIS_SERP = [
+    ("https://sultra.antaranews.com/berita/512345/harga-gabah-petani-konawe-selatan-naik", "Harga gabah petani Konawe Selatan naik menjelang panen raya", "3 hari lalu"),
+    ("https://kendarikita.com/2024/02/14/panen-padi-andoolo/", "Panen padi di Andoolo capai 6 ton per hektare", "14 Feb 2024"),
+    ("https://www.google.com/url?q=https://zonasultra.id/produksi-padi-konsel.html&sa=U", "Produksi padi Konsel & Kolaka meningkat 12 persen", "2 minggu lalu"),
+]
+
+
+def _baca(nama):
+    with open(os.path.join(FIXTURES, nama), encoding="utf-8") as f:
+        return f.read()
+
+
+class _Elemen:
+    """WebElement tiruan di atas elemen BeautifulSoup."""
+
+    def __init__(self, tag, driver):
+        self._tag = tag
+        self._driver = driver
+
+    @property
+    def text(self):
+        # Seperti WebElement.text: spasi dan baris baru tidak dirapikan
+        return self._tag.get_text()
+
+    def get_attribute(self, nama):
+        nilai = self._tag.get(nama)
+        # Seperti browser, href dikembalikan sebagai URL absolut
+        return urljoin(self._driver.current_url, nilai) if nama == "href" and nilai is not None else nilai
+
+    def find_elements(self, by, nilai):
+        return [_Elemen(tag, self._driver) for tag in _cari(self._tag, by, nilai)]
+
+    def find_element(self, by, nilai):
+        hasil = self.find_elements(by, nilai)
+        if not hasil:
+            raise NoSuchElementException(nilai)
+        return hasil[0]
+
+
+def _cari(tag, by, nilai):
+    if by == By.CSS_SELECTOR:
+        return tag.select(nilai)
+    if by == By.TAG_NAME:
+        return tag.find_all(nilai)
+    if by == By.ID:
+        return tag.find_all(id=nilai)
+    if by == By.XPATH and nilai == '//a[contains(@href, "start=")]':
+        return tag.select('a[href*="start="]')
+    raise NotImplementedError((by, nilai))
+
+
+class _Driver:
+    """Driver tiruan yang 'membuka' URL apa pun dengan isi satu berkas fixture."""
+
+    def __init__(self, html):
+        self._html = html
+        self._soup = None
+        self.current_url = None
+
+    def get(self, url):
+        self.current_url = url
+        self._soup = BeautifulSoup(self._html, "html.parser")
+
+    def find_elements(self, by, nilai):
+        return [_Elemen(tag, self) for tag in _cari(self._soup, by, nilai)]
+
+    def execute_script(self, skrip):
+        assert skrip == "return document.readyState"
+        return "complete"
+
+    def quit(self):
+        pass
+
+
+def _backend(html):
+    return SeleniumBackend(jumlah=1, pembuat=lambda: _Driver(html))
+
+
+def test_http_membaca_baris():
+    assert parse_halaman_html(_baca("serp_nws.html"), URL) == BARIS_SERP
+
+
+def test_http_membaca_start():
+    assert parse_start_html(_baca("serp_nws.html"), URL) == [0, 10, 20]
+    assert parse_start_html(_baca("paginasi.html"), URL) == [0, 10, 20, 30]
+
+
+def test_http_halaman_kosong():
+    assert parse_halaman_html(_baca("serp_kosong.html"), URL) is None
+    assert parse_start_html(_baca("serp_kosong.html"), URL) == [0]
+
+
+def test_selenium_sama_dengan_http():
+    html = _baca("serp_nws.html")
+    backend = _backend(html)
+    try:
+        start_values, baris = backend._buka(URL, baca_start=True)
+        assert baris == parse_halaman_html(html, URL) == BARIS_SERP
+        assert start_values == parse_start_html(html, URL)
+        assert backend._buka(URL + "&start=10") == BARIS_SERP
+    finally:
+        backend.tutup()
+
+
+def test_selenium_baca_hasil_langsung():
+    driver = _Driver(_baca("serp_nws.html"))
+    driver.get(URL)
+    assert SeleniumBackend(jumlah=1, pembuat=lambda: driver)._baca_hasil(driver) == BARIS_SERP
+
+
+def test_selenium_paginasi():
+    html = _baca("paginasi.html")
+    backend = _backend(f"<html><body><div id='botstuff'>{html}</div></body></html>")
+    try:
+        start_values, baris = backend._buka(URL, baca_start=True)
+    finally:
+        backend.tutup()
+    assert start_values == parse_start_html(html, URL) == [0, 10, 20, 30]
+    assert baris is None
+
+
+def test_selenium_halaman_kosong():
+    backend = _backend(_baca("serp_kosong.html"))
+    try:
+        assert backend._buka(URL, baca_start=True) == ([0], None)
+    finally:
+        backend.tutup()
+
+
+def test_halaman_tak_dikenal_bukan_halaman_kosong():
+    assert adalah_halaman_hasil(_baca("serp_nws.html"))
+    assert adalah_halaman_hasil(_baca("serp_kosong.html"))
+    assert not adalah_halaman_hasil("<html><body><div id='lain'>Memuat...</div></body></html>")
+
+
+def test_selenium_timeout_tidak_dianggap_kosong():
+    backend = _backend("<html><body><div id='lain'>Memuat...</div></body></html>")
+    backend.batas_tunggu = 0.3
+    try:
+        with pytest.raises(HalamanTidakTerbaca):
+            backend._buka(URL, baca_start=True)
+    finally:
+        backend.tutup()
@@ -0,0 +1,126 @@
+"""Job yang terputus lalu dilanjutkan harus menulis hasil yang sama persis dengan job tanpa jeda."""
+import json
+import os
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from skena import backend as modul_backend
+from skena import cache as modul_cache
+from skena import job, pencarian
+from skena.job import Checkpoint
+from skena.pencarian import Query
+
+PARAMETER = {
+    "daerah": {"Konawe Selatan": ["Andoolo", "Tinanggea"]},
+    "kata_kunci": {"Tanaman Pangan": ["padi", "gabah"], "Hortikultura": ["cabai", "padi"]},
+    "tanggal_awal": "1/1/2024",
+    "tanggal_akhir": "3/31/2024",
+    "backend": "http",
+    "format": "csv",
+    "duplikat": "gabung",
+}
+
+
+def _serp(keyword, start):
+    judul = [
+        f"Harga {keyword} di Andoolo naik - Portal {start}",
+        f"Panen {keyword} {start} dimulai",
+        f"Petani {keyword} di Tinanggea bertambah",
+    ]
+    return [(f"https://{keyword}.test/{start}/{i}", teks, f"{i + 1} hari lalu") for i, teks in enumerate(judul)]
+
+
+class _Putus(BaseException):
+    """Worker mati di tengah jalan."""
+
+
+class _Backend:
+    jumlah = 1
+
+    def __init__(self, putus_di=None):
+        self.putus_di = putus_di
+
+    def ambil_pertama(self, url):
+        return [0, 10], _serp(self._keyword(url), 0)
+
+    def ambil_halaman(self, url):
+        keyword, start = self._keyword(url), int(parse_qs(urlsplit(url).query)["start"][0])
+        if (keyword, start) == self.putus_di:
+            raise _Putus()
+        return _serp(keyword, start)
+
+    @staticmethod
+    def _keyword(url):
+        return parse_qs(urlsplit(url).query)["q"][0].split(" ")[0]
+
+    def tutup(self):
+        pass
+
+
+def _ringkasan(links, cache=None, memo=None, gagal=None):
+    return [f"Berita dari Andoolo ({link})" if link.endswith("/1") else "" for link in links]
+
+
+@pytest.fixture(autouse=True)
+def _lingkungan(tmp_path, monkeypatch):
+    monkeypatch.setattr(job, "JOB_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setattr(modul_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(pencarian, "ambil_ringkasan_batch", _ringkasan)
+
+
+def _jalankan(monkeypatch, job_id, backend):
+    monkeypatch.setattr(modul_backend, "buat_backend", lambda nama, jumlah: backend)
+    job.jalankan_job(job_id)
+
+
+def _hasil(job_id):
+    with open(job.path_hasil(job_id, "csv"), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("baris_terpotong", [False, True])
+def test_lanjutan_sama_dengan_run_utuh(monkeypatch, baris_terpotong):
+    utuh = job.buat_job({**PARAMETER, "bypass_cache": True})
+    _jalankan(monkeypatch, utuh, _Backend())
+    assert job.baca_status(utuh)["status"] == "selesai"
+
+    terputus = job.buat_job({**PARAMETER, "bypass_cache": True})
+    # Putus di halaman kedua kata kunci kedua: satu query tuntas, satu baru separuh
+    with pytest.raises(_Putus):
+        _jalankan(monkeypatch, terputus, _Backend(putus_di=("gabah", 10)))
+    assert not os.path.exists(job.path_hasil(terputus, "csv"))
+    path_checkpoint = job._path(terputus, "checkpoint.jsonl")
+    gabah = Query("gabah", "Konawe Selatan", "1/1/2024", "3/31/2024")
+    assert Checkpoint(path_checkpoint).halaman(gabah, 0) is not None
+    if baris_terpotong:
+        with open(path_checkpoint, "a", encoding="utf-8") as f:
+            f.write('{"jenis": "halaman", "query": "[\\"gabah\\"')
+
+    _jalankan(monkeypatch, terputus, _Backend())
+    assert job.baca_status(terputus)["status"] == "selesai"
+    assert _hasil(terputus) == _hasil(utuh)
+    with open(path_checkpoint, encoding="utf-8") as f:
+        assert all(json.loads(baris) for baris in f)
+
+
+def test_checkpoint_membuang_baris_terpotong(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    query = Query("padi", "Konawe Selatan", "1/1/2024", "3/31/2024")
+    baris = [{"Kata Kunci": "padi", "Judul": "Panen", "Link": "https://a.test/1", "Tanggal": "1 hari lalu", "Ringkasan": ""}]
+
+    checkpoint = Checkpoint(path)
+    checkpoint.catat_daftar_start(query, [0, 10])
+    checkpoint.catat_halaman(query, 0, baris, [("https://a.test/1", "Panen")])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"jenis": "halaman", "query": ')
+
+    checkpoint = Checkpoint(path)
+    assert checkpoint.daftar_start(query) == [0, 10]
+    assert checkpoint.halaman(query, 0) == baris
+    assert checkpoint.dilihat(query, 0) == [["https://a.test/1", "Panen"]]
+    assert checkpoint.halaman(query, 10) is None
+
+    # Entri baru ditulis di baris sendiri, tidak tersambung ke sisa baris terpotong
+    checkpoint.catat_halaman(query, 10, [])
+    assert Checkpoint(path).halaman(query, 10) == []
@@ -0,0 +1,129 @@
+"""Berita sindikasi diputuskan per kategori, tidak bergantung urutan selesainya kata kunci."""
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from skena import pencarian
+from skena.backend import HalamanTidakTerbaca
+from skena.duplikat import AMBANG
+from skena.ekspor import KOLOM_SUMBER_LAIN
+from skena.pencarian import Query, cari_berita_keyword, gabungkan_kategori
+
+SERP = {
+    "padi": [
+        ("https://a.test/1", "Harga gabah di Konawe Selatan naik menjelang panen raya - Portal A", "1 hari lalu"),
+        ("https://a.test/2", "Petani mulai tanam jagung", "2 hari lalu"),
+        ("https://a.test/3", "Harga gabah di Konawe Selatan naik menjelang panen raya - Portal C", "1 hari lalu"),
+    ],
+    "gabah": [
+        ("https://b.test/1", "Harga gabah di Konawe Selatan naik menjelang panen raya - Portal B", "1 hari lalu"),
+        ("https://b.test/2", "Pasar tani dibuka", "3 hari lalu"),
+    ],
+}
+
+# Hanya ringkasan yang menyebut kecamatan; judul cerita sindikasi tidak
+RINGKASAN = {
+    "https://a.test/1": "Petani di Andoolo menikmati harga gabah yang naik.",
+    "https://a.test/2": "Petani Andoolo mulai menanam jagung.",
+    "https://a.test/3": "Harga gabah naik menjelang panen.",
+    "https://b.test/1": "Harga gabah naik menjelang panen.",
+    "https://b.test/2": "Pasar tani dibuka di Tinanggea.",
+}
+
+
+class _Backend:
+    def ambil_pertama(self, url):
+        keyword = parse_qs(urlsplit(url).query)["q"][0].split(" ")[0]
+        return [0], list(SERP[keyword])
+
+
+class _Pencocok:
+    def cocok_judul(self, keyword, judul):
+        return False
+
+    def cocok(self, keyword, judul, ringkasan):
+        return any(lokasi in f"{judul} {ringkasan}" for lokasi in ("Andoolo", "Tinanggea"))
+
+
+GAGAL = set()
+
+
+def _ambil_ringkasan_palsu(links, cache=None, memo=None, gagal=None):
+    if gagal is not None:
+        gagal.extend(link for link in links if link in GAGAL)
+    return ["" if link in GAGAL else RINGKASAN[link] for link in links]
+
+
+@pytest.fixture(autouse=True)
+def _ringkasan_palsu(monkeypatch):
+    monkeypatch.setattr(pencarian, "ambil_ringkasan_batch", _ambil_ringkasan_palsu)
+    GAGAL.clear()
+
+
+def _query(keyword):
+    return Query(keyword, "Konawe Selatan", "1/1/2024", "3/31/2024")
+
+
+def _jalankan(urutan, ambang=AMBANG):
+    memo, hasil = {}, {}
+    for keyword in urutan:
+        hasil[_query(keyword)], _ = cari_berita_keyword(_Backend(), _query(keyword), _Pencocok(), memo_ringkasan=memo, ambang_duplikat=ambang)
+    return hasil
+
+
+@pytest.mark.parametrize("mode", ["gabung", "lewati"])
+def test_tidak_bergantung_urutan_kata_kunci(mode):
+    maju, mundur = _jalankan(["padi", "gabah"]), _jalankan(["gabah", "padi"])
+    assert maju == mundur
+    for kategori in (["padi", "gabah"], ["gabah"], ["padi"]):
+        daftar = [_query(k) for k in kategori]
+        assert gabungkan_kategori(daftar, maju, mode_duplikat=mode) == gabungkan_kategori(daftar, mundur, mode_duplikat=mode)
+
+
+def test_salinan_hanya_memakai_ringkasan_wakil_di_query_yang_sama():
+    hasil = _jalankan(["padi", "gabah"])
+    # Salinan di query lain difilter dengan ringkasannya sendiri
+    assert hasil[_query("gabah")] == [
+        {"Kata Kunci": "gabah", "Judul": "Pasar tani dibuka", "Link": "https://b.test/2", "Tanggal": "3 hari lalu", "Ringkasan": RINGKASAN["https://b.test/2"]},
+    ]
+    # Salinan di query yang sama memakai ringkasan wakilnya
+    assert [(b["Link"], b["Ringkasan"]) for b in hasil[_query("padi")]] == [
+        ("https://a.test/1", RINGKASAN["https://a.test/1"]),
+        ("https://a.test/2", RINGKASAN["https://a.test/2"]),
+        ("https://a.test/3", RINGKASAN["https://a.test/1"]),
+    ]
+    # Tanpa deteksi sindikasi salinan itu tidak lolos
+    assert [b["Link"] for b in _jalankan(["padi"], ambang=None)[_query("padi")]] == ["https://a.test/1", "https://a.test/2"]
+
+
+def test_salinan_digabung_atau_dibuang_per_kategori():
+    hasil = _jalankan(["gabah", "padi"])
+    padi, gabah = _query("padi"), _query("gabah")
+
+    baris = gabungkan_kategori([padi, gabah], hasil, mode_duplikat="gabung")
+    assert [(b["Nomor"], b["Link"], b[KOLOM_SUMBER_LAIN]) for b in baris] == [
+        (1, "https://a.test/1", "https://a.test/3"),
+        (2, "https://a.test/2", ""),
+        (3, "https://b.test/2", ""),
+    ]
+    assert [b["Link"] for b in gabungkan_kategori([padi, gabah], hasil, mode_duplikat="lewati")] == ["https://a.test/1", "https://a.test/2", "https://b.test/2"]
+    assert [b["Link"] for b in gabungkan_kategori([padi], hasil)] == ["https://a.test/1", "https://a.test/2", "https://a.test/3"]
+    # Baris hasil pencarian tidak diubah oleh penggabungan
+    assert all(KOLOM_SUMBER_LAIN not in b for daftar in hasil.values() for b in daftar)
+
+
+def test_halaman_tak_terbaca_menjadi_peringatan():
+    class _BackendMacet:
+        def ambil_pertama(self, url):
+            raise HalamanTidakTerbaca("timeout")
+
+    query = Query("padi", "Konawe Selatan", "1/1/2024", "3/31/2024")
+    baris, catatan = cari_berita_keyword(_BackendMacet(), query, _Pencocok())
+    assert baris == [] and [jenis for jenis, _ in catatan] == ["warning"]
+
+
+def test_ringkasan_gagal_menjadi_peringatan():
+    GAGAL.add("https://a.test/2")
+    baris, catatan = cari_berita_keyword(_Backend(), _query("padi"), _Pencocok(), ambang_duplikat=AMBANG)
+    assert [b["Link"] for b in baris] == ["https://a.test/1", "https://a.test/3"]
+    assert [jenis for jenis, _ in catatan] == ["warning"]
@@ -0,0 +1,103 @@
+"""Laju per host, jeda percobaan ulang dan batas Retry-After."""
+import pytest
+
+from skena import penjadwal
+from skena.penjadwal import JEDA_MAKS, Penjadwal, PerluDiulang, TokenBucket
+
+
+class _Jam:
+    """Pengganti time.monotonic/time.sleep: tidur hanya memajukan jam."""
+
+    def __init__(self):
+        self.sekarang = 1000.0
+        self.tidur = []
+
+    def monotonic(self):
+        return self.sekarang
+
+    def sleep(self, detik):
+        self.tidur.append(detik)
+        self.sekarang += detik
+
+
+@pytest.fixture
+def jam(monkeypatch):
+    jam = _Jam()
+    monkeypatch.setattr(penjadwal.time, "monotonic", jam.monotonic)
+    monkeypatch.setattr(penjadwal.time, "sleep", jam.sleep)
+    return jam
+
+
+def test_bucket_menunggu_sesuai_laju(jam):
+    bucket = TokenBucket(2.0)
+    bucket.ambil()
+    bucket.ambil()
+    assert jam.tidur == [pytest.approx(0.5)]
+
+
+def test_bucket_aimd(jam):
+    bucket = TokenBucket(2.0, laju_maks=3.0)
+    bucket.ditolak()
+    assert bucket.laju == 1.0
+    for _ in range(30):
+        bucket.berhasil()
+    assert bucket.laju == 3.0
+    for _ in range(10):
+        bucket.ditolak()
+    assert bucket.laju == bucket.laju_min
+
+
+def test_bucket_retry_after_dibatasi(jam):
+    bucket = TokenBucket(0)
+    bucket.ditolak(3600)
+    bucket.ambil()
+    assert sum(jam.tidur) == pytest.approx(JEDA_MAKS)
+
+
+def test_jeda_eksponensial_dan_dibatasi():
+    penj = Penjadwal(0, jeda_awal=1.0)
+    for percobaan in range(1, 10):
+        dasar = min(JEDA_MAKS, 2 ** (percobaan - 1))
+        assert dasar / 2 <= penj.jeda(percobaan) <= dasar
+    assert penj.jeda(1, 5) == 5
+    assert penj.jeda(1, 3600) == JEDA_MAKS
+
+
+def test_jalankan_mengulang_lalu_berhasil(jam):
+    percobaan = []
+
+    def fungsi():
+        percobaan.append(1)
+        if len(percobaan) < 3:
+            raise PerluDiulang("HTTP 429", retry_after=3600)
+        return "ok"
+
+    assert Penjadwal(0, maks_percobaan=4).jalankan("https://a.test/x", fungsi) == "ok"
+    assert len(percobaan) == 3
+    assert max(jam.tidur) <= JEDA_MAKS
+
+
+def test_jalankan_melempar_setelah_percobaan_terakhir(jam):
+    def fungsi():
+        raise PerluDiulang("HTTP 503")
+
+    with pytest.raises(PerluDiulang):
+        Penjadwal(0, maks_percobaan=2).jalankan("https://a.test/x", fungsi)
+
+
+def test_jalankan_tidak_mengulang_error_lain(jam):
+    percobaan = []
+
+    def fungsi():
+        percobaan.append(1)
+        raise ValueError("rusak")
+
+    with pytest.raises(ValueError):
+        Penjadwal(0).jalankan("https://a.test/x", fungsi)
+    assert percobaan == [1] and jam.tidur == []
+
+
+def test_bucket_per_host():
+    penj = Penjadwal(1.0)
+    assert penj.bucket("https://A.test/1") is penj.bucket("https://a.test/2")
+    assert penj.bucket("https://a.test/1") is not penj.bucket("https://b.test/1")
@@ -0,0 +1,97 @@
+"""Parser ringkasan streaming harus menghasilkan teks yang sama dengan versi BeautifulSoup."""
+import pytest
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from skena import ringkasan
+from skena.ringkasan import UKURAN_POTONGAN, _ambil_ringkasan_penuh, _ambil_ringkasan_stream
+
+
+class _Respons:
+    def __init__(self, html, content_type="text/html; charset=utf-8"):
+        self.content = html.encode("utf-8")
+        self.status_code = 200
+        self.headers = CaseInsensitiveDict({"Content-Type": content_type} if content_type else {})
+        # Sama seperti requests: text/* tanpa charset dianggap ISO-8859-1
+        self.encoding = get_encoding_from_headers(self.headers)
+        self.text = self.content.decode(self.encoding or "utf-8", errors="replace")
+        self.dibaca = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_content(self, chunk_size=1):
+        self.dibaca = True
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+
+class _Session:
+    def __init__(self, html, content_type="text/html; charset=utf-8"):
+        self.html = html
+        self.content_type = content_type
+        self.respons = []
+
+    def get(self, link, **kwargs):
+        self.respons.append(_Respons(self.html, self.content_type))
+        return self.respons[-1]
+
+
+def _halaman_terpotong(teks, potong_di):
+    """Halaman yang batas potongan pertamanya jatuh tepat setelah ``teks[:potong_di]``."""
+    awal = "<html><head><title>x</title></head><body><div>"
+    akhir = "</div><p>" + teks + "</p><p>paragraf kedua</p></body></html>"
+    isi = "<!--" + "x" * (UKURAN_POTONGAN - len(awal) - len("<!---->") - len("</div><p>") - potong_di) + "-->"
+    return awal + isi + akhir
+
+
+HALAMAN = {
+    "deskripsi": '<html><head><meta name="description" content="Deskripsi berita"><meta property="og:description" content="OG"></head><body><p>Isi</p></body></html>',
+    "og": '<html><head><meta property="og:description" content="Ringkasan OG"></head><body><p>Isi</p></body></html>',
+    "deskripsi_kosong": '<html><head><meta name="description" content=""></head><body><p>  Paragraf   pertama </p></body></html>',
+    "paragraf_bertingkat": "<html><body><p>Harga <b>padi</b> naik di <a href='#'>Konawe Selatan</a> &amp; Kolaka.</p><p>Kedua</p></body></html>",
+    "paragraf_script": "<html><body><p>Sebelum <script>var x = 1;</script> sesudah</p></body></html>",
+    "paragraf_komentar": "<html><body><p>Satu <!-- catatan --> dua</p></body></html>",
+    "tanpa_ringkasan": "<html><body><div>Tidak ada paragraf</div></body></html>",
+    "terpotong_di_spasi": _halaman_terpotong("Harga padi di Konawe Selatan naik tajam.", len("Harga padi di")),
+    "terpotong_di_kata": _halaman_terpotong("Harga padi di Konawe Selatan naik tajam.", len("Harga padi di Kon")),
+}
+
+
+@pytest.mark.parametrize("nama", sorted(HALAMAN))
+def test_streaming_sama_dengan_versi_penuh(nama):
+    session = _Session(HALAMAN[nama])
+    assert _ambil_ringkasan_stream("http://contoh.test/a", session) == _ambil_ringkasan_penuh("http://contoh.test/a", session)
+
+
+def test_paragraf_melewati_batas_potongan():
+    html = HALAMAN["terpotong_di_spasi"]
+    assert html.encode("utf-8")[:UKURAN_POTONGAN].endswith(b"Harga padi di")
+    assert _ambil_ringkasan_stream("http://contoh.test/a", _Session(html)) == "Harga padi di Konawe Selatan naik tajam."
+
+
+def test_bukan_html_dilewati():
+    session = _Session("<p>teks</p>", content_type="application/pdf")
+    assert _ambil_ringkasan_stream("http://contoh.test/a", session) == ""
+    assert not session.respons[0].dibaca
+
+
+@pytest.mark.parametrize("content_type", ["text/html", "TEXT/HTML ; charset=UTF-8", None])
+def test_html_tanpa_charset_dibaca(content_type):
+    session = _Session("<html><body><p>Panen padi di Andoolo</p></body></html>", content_type=content_type)
+    assert _ambil_ringkasan_stream("http://contoh.test/a", session) == "Panen padi di Andoolo"
+    assert _ambil_ringkasan_stream("http://contoh.test/a", session) == _ambil_ringkasan_penuh("http://contoh.test/a", session)
+
+
+def test_batch_mencatat_link_gagal(monkeypatch):
+    class _SessionPutus:
+        def get(self, link, **kwargs):
+            raise ConnectionError("putus")
+
+    monkeypatch.setattr(ringkasan, "get_session", lambda: _SessionPutus())
+    memo, gagal = {}, []
+    assert ringkasan.ambil_ringkasan_batch(["http://contoh.test/a"], memo=memo, gagal=gagal) == [""]
+    assert gagal == ["http://contoh.test/a"] and memo == {}